@@ -20,7 +20,9 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# Callers that pass their own connection, e.g. the test setup, keep their logging configuration.
+if "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -83,5 +85,8 @@ async def run_migrations_online() -> None:
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif "connection" in config.attributes:
+    # connection of a caller that runs in an event loop already, e.g. the test setup
+    do_run_migrations(config.attributes["connection"])
 else:
     asyncio.run(run_migrations_online())
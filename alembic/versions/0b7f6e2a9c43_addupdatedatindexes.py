@@ -0,0 +1,27 @@
+"""AddUpdatedAtIndexes.
+
+Revision ID: 0b7f6e2a9c43
+Revises: d3a9c4e8b215
+Create Date: 2026-10-17 23:48:20.641905
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0b7f6e2a9c43"
+down_revision = "d3a9c4e8b215"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_company_updated_at", "company", ["updated_at"], unique=False)
+    op.create_index("ix_advocate_updated_at", "advocate", ["updated_at"], unique=False)
+    op.create_index("ix_socialaccount_updated_at", "socialaccount", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_socialaccount_updated_at", table_name="socialaccount")
+    op.drop_index("ix_advocate_updated_at", table_name="advocate")
+    op.drop_index("ix_company_updated_at", table_name="company")
@@ -0,0 +1,125 @@
+"""AddCompanyStats.
+
+Revision ID: 4a7c9e2d5b18
+Revises: 6f2d8a1b5e94
+Create Date: 2026-10-18 01:12:45.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4a7c9e2d5b18"
+down_revision = "6f2d8a1b5e94"
+branch_labels = None
+depends_on = None
+
+STATS_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION companystats_add_companies() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO companystats (id, advocates_count, years_of_experience_total, created_at, updated_at)
+        SELECT id, 0, 0, localtimestamp, localtimestamp FROM new_rows
+        ON CONFLICT (id) DO NOTHING;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION companystats_count_advocates() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        company_ids uuid[];
+        counts integer[];
+        totals integer[];
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT array_agg(company_id), array_agg(-1), array_agg(-years_of_experience)
+            INTO company_ids, counts, totals
+            FROM old_rows;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT
+                company_ids || array_agg(company_id),
+                counts || array_agg(1),
+                totals || array_agg(years_of_experience)
+            INTO company_ids, counts, totals
+            FROM new_rows;
+        END IF;
+        -- rows are locked by the update, so concurrent changes are added one after another
+        INSERT INTO companystats AS stats (id, advocates_count, years_of_experience_total, created_at, updated_at)
+        SELECT change.id, sum(change.count), sum(change.total), localtimestamp, localtimestamp
+        FROM unnest(company_ids, counts, totals) AS change (id, count, total)
+        GROUP BY change.id
+        HAVING sum(change.count) <> 0 OR sum(change.total) <> 0
+        ORDER BY change.id
+        ON CONFLICT (id) DO UPDATE SET
+            advocates_count = stats.advocates_count + excluded.advocates_count,
+            years_of_experience_total = stats.years_of_experience_total + excluded.years_of_experience_total,
+            updated_at = excluded.updated_at;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER company_insert_companystats
+    AFTER INSERT ON company REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION companystats_add_companies()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER advocate_insert_companystats
+    AFTER INSERT ON advocate REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION companystats_count_advocates()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER advocate_update_companystats
+    AFTER UPDATE ON advocate REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION companystats_count_advocates()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER advocate_delete_companystats
+    AFTER DELETE ON advocate REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION companystats_count_advocates()
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "companystats",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("advocates_count", sa.Integer(), nullable=False),
+        sa.Column("years_of_experience_total", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["id"], ["company.id"], name=op.f("fk_companystats_id_company"), ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_companystats")),
+    )
+    op.create_index("ix_companystats_created_at_id", "companystats", ["created_at", "id"], unique=False)
+    op.create_index(op.f("ix_companystats_updated_at"), "companystats", ["updated_at"], unique=False)
+    # triggers lock the tables until the end of the migration, so no change is missed by the initial totals
+    for statement in STATS_TRIGGERS:
+        op.execute(statement)
+    op.execute(
+        """
+        INSERT INTO companystats (id, advocates_count, years_of_experience_total, created_at, updated_at)
+        SELECT
+            company.id, count(advocate.id), coalesce(sum(advocate.years_of_experience), 0),
+            localtimestamp, localtimestamp
+        FROM company LEFT OUTER JOIN advocate ON advocate.company_id = company.id
+        GROUP BY company.id
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER advocate_delete_companystats ON advocate")
+    op.execute("DROP TRIGGER advocate_update_companystats ON advocate")
+    op.execute("DROP TRIGGER advocate_insert_companystats ON advocate")
+    op.execute("DROP TRIGGER company_insert_companystats ON company")
+    op.execute("DROP FUNCTION companystats_count_advocates()")
+    op.execute("DROP FUNCTION companystats_add_companies()")
+    op.drop_index(op.f("ix_companystats_updated_at"), table_name="companystats")
+    op.drop_index("ix_companystats_created_at_id", table_name="companystats")
+    op.drop_table("companystats")
@@ -0,0 +1,27 @@
+"""AddKeysetPaginationIndexes.
+
+Revision ID: 5c1e8f3a9d27
+Revises: ba261f0697dd
+Create Date: 2026-10-17 10:12:41.318205
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5c1e8f3a9d27"
+down_revision = "ba261f0697dd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_company_created_at_id", "company", ["created_at", "id"], unique=False)
+    op.create_index("ix_advocate_created_at_id", "advocate", ["created_at", "id"], unique=False)
+    op.create_index("ix_socialaccount_created_at_id", "socialaccount", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_socialaccount_created_at_id", table_name="socialaccount")
+    op.drop_index("ix_advocate_created_at_id", table_name="advocate")
+    op.drop_index("ix_company_created_at_id", table_name="company")
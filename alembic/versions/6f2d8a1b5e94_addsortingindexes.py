@@ -0,0 +1,27 @@
+"""AddSortingIndexes.
+
+Revision ID: 6f2d8a1b5e94
+Revises: 0b7f6e2a9c43
+Create Date: 2026-10-18 00:21:37.904412
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "6f2d8a1b5e94"
+down_revision = "0b7f6e2a9c43"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_company_name_id", "company", ["name", "id"], unique=False)
+    op.create_index("ix_advocate_name_id", "advocate", ["name", "id"], unique=False)
+    op.create_index("ix_advocate_years_of_experience_id", "advocate", ["years_of_experience", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_advocate_years_of_experience_id", table_name="advocate")
+    op.drop_index("ix_advocate_name_id", table_name="advocate")
+    op.drop_index("ix_company_name_id", table_name="company")
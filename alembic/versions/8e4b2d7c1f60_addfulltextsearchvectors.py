@@ -0,0 +1,47 @@
+"""AddFullTextSearchVectors.
+
+Revision ID: 8e4b2d7c1f60
+Revises: 5c1e8f3a9d27
+Create Date: 2026-10-17 22:41:09.502117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "8e4b2d7c1f60"
+down_revision = "5c1e8f3a9d27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "advocate",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', name || ' ' || username || ' ' || short_bio)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_advocate_search_vector", "advocate", ["search_vector"], unique=False, postgresql_using="gin")
+    op.add_column(
+        "company",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', name)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_company_search_vector", "company", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_company_search_vector", table_name="company", postgresql_using="gin")
+    op.drop_column("company", "search_vector")
+    op.drop_index("ix_advocate_search_vector", table_name="advocate", postgresql_using="gin")
+    op.drop_column("advocate", "search_vector")
@@ -0,0 +1,74 @@
+"""AlterCompanyStatsUtcTimestamps.
+
+Revision ID: 9d3f5b7e2a61
+Revises: 4a7c9e2d5b18
+Create Date: 2026-10-18 02:34:11.502846
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "9d3f5b7e2a61"
+down_revision = "4a7c9e2d5b18"
+branch_labels = None
+depends_on = None
+
+STATS_FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION companystats_add_companies() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO companystats (id, advocates_count, years_of_experience_total, created_at, updated_at)
+        SELECT id, 0, 0, {now}, {now} FROM new_rows
+        ON CONFLICT (id) DO NOTHING;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION companystats_count_advocates() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        company_ids uuid[];
+        counts integer[];
+        totals integer[];
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT array_agg(company_id), array_agg(-1), array_agg(-years_of_experience)
+            INTO company_ids, counts, totals
+            FROM old_rows;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT
+                company_ids || array_agg(company_id),
+                counts || array_agg(1),
+                totals || array_agg(years_of_experience)
+            INTO company_ids, counts, totals
+            FROM new_rows;
+        END IF;
+        -- rows are locked by the update, so concurrent changes are added one after another
+        INSERT INTO companystats AS stats (id, advocates_count, years_of_experience_total, created_at, updated_at)
+        SELECT change.id, sum(change.count), sum(change.total), {now}, {now}
+        FROM unnest(company_ids, counts, totals) AS change (id, count, total)
+        GROUP BY change.id
+        HAVING sum(change.count) <> 0 OR sum(change.total) <> 0
+        ORDER BY change.id
+        ON CONFLICT (id) DO UPDATE SET
+            advocates_count = stats.advocates_count + excluded.advocates_count,
+            years_of_experience_total = stats.years_of_experience_total + excluded.years_of_experience_total,
+            updated_at = excluded.updated_at;
+        RETURN NULL;
+    END;
+    $$
+    """,
+)
+
+
+def upgrade() -> None:
+    # timestamps are stored in UTC, rather than in the time zone of the database session
+    for statement in STATS_FUNCTIONS:
+        op.execute(statement.format(now="timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    for statement in STATS_FUNCTIONS:
+        op.execute(statement.format(now="localtimestamp"))
@@ -0,0 +1,38 @@
+"""AddTrigramIndexes.
+
+Revision ID: d3a9c4e8b215
+Revises: 8e4b2d7c1f60
+Create Date: 2026-10-17 23:05:48.117623
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3a9c4e8b215"
+down_revision = "8e4b2d7c1f60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_advocate_name_trgm", "advocate", ["name"],
+        unique=False, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_advocate_username_trgm", "advocate", ["username"],
+        unique=False, postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_company_name_trgm", "company", ["name"],
+        unique=False, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_company_name_trgm", table_name="company", postgresql_using="gin")
+    op.drop_index("ix_advocate_username_trgm", table_name="advocate", postgresql_using="gin")
+    op.drop_index("ix_advocate_name_trgm", table_name="advocate", postgresql_using="gin")
+    # the extension may have been installed before and be used by other objects, so it is left in place
@@ -0,0 +1,89 @@
+"""Plans and latency of `created-*`/`updated-*` time-window queries with and without indexes.
+
+Fills the `company` table with `ROWS` rows, timestamped over the last year, in a transaction that is rolled back
+in the end, and runs `EXPLAIN ANALYZE` of the repository's `BeforeAfter` filter statements for a one day window:
+- as is, served by `ix_company_created_at_id` and `ix_company_updated_at`;
+- with index scans disabled, i.e. the sequential scan every query did before the indexes were added.
+
+Requires a database configured by `HOC_DB_*` environment variables with applied migrations.
+
+Usage:
+    PYTHONPATH=src python benchmarks/datetime_filters.py
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from sqlalchemy import select, text
+
+from hackathon.config.settings import get_settings
+from hackathon.domain.companies import Company, CompanyRepository
+from hackathon.infrastructure.db.postgres import Database
+from hackathon.lib.orm import utcnow
+from hackathon.lib.repositories.filters import BeforeAfter
+
+ROWS = 200_000
+
+FILL_STATEMENT = text(
+    """
+    INSERT INTO company (id, name, summary, created_at, updated_at)
+    SELECT gen_random_uuid(), 'benchmark-' || i, 'Summary', created_at, created_at + random() * (now() - created_at)
+    FROM generate_series(1, :rows) AS i, LATERAL (SELECT now() - random() * interval '365 days' AS created_at) AS t
+    """,
+)
+
+DISABLE_INDEX_SCANS = ("enable_indexscan", "enable_indexonlyscan", "enable_bitmapscan")
+
+
+@asynccontextmanager
+async def session_factory():
+    yield None
+
+
+def describe_plan(plan: dict) -> str:
+    """Describe plan nodes, e.g. a bitmap heap scan of an index."""
+    description = plan["Node Type"]
+    if "Index Name" in plan:
+        description += f" on {plan['Index Name']}"
+    return " / ".join([description, *(describe_plan(child) for child in plan.get("Plans", ()))])
+
+
+async def main() -> None:
+    database = Database(get_settings().database.copy(update={"QUERY_STATS": False, "SLOW_QUERY_SECONDS": 0}))
+    repository = CompanyRepository(session_factory)
+    after = utcnow() - timedelta(days=1)
+    statements = {
+        f"{field_name} > 1 day ago": repository._apply_filters(
+            select(Company.id), BeforeAfter(field_name, None, after))
+        for field_name in ("created_at", "updated_at")
+    }
+
+    print(f"{'':<25} {'scan':<55} {'rows':>6} {'without indexes':>16} {'with indexes':>13} {'speedup':>8}")
+    try:
+        async with database.engine.connect() as connection:
+            await connection.execute(FILL_STATEMENT, {"rows": ROWS})
+            await connection.execute(text("ANALYZE company"))
+            for name, statement in statements.items():
+                sql = statement.compile(database.engine, compile_kwargs={"literal_binds": True})
+                explain = text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+
+                [[indexed]] = (await connection.execute(explain)).all()
+                for setting in DISABLE_INDEX_SCANS:
+                    await connection.execute(text(f"SET LOCAL {setting} = off"))
+                [[sequential]] = (await connection.execute(explain)).all()
+                for setting in DISABLE_INDEX_SCANS:
+                    await connection.execute(text(f"RESET {setting}"))
+
+                plan = indexed[0]["Plan"]
+                before, after_ = sequential[0]["Execution Time"], indexed[0]["Execution Time"]
+                print(
+                    f"{name:<25} {describe_plan(plan):<55} {plan['Actual Rows']:>6} "
+                    f"{before:>13.2f} ms {after_:>10.2f} ms {before / after_:>7.1f}x",
+                )
+            await connection.rollback()
+    finally:
+        await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
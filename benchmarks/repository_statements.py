@@ -0,0 +1,66 @@
+"""Per-request repository overhead: object construction and SQL compilation.
+
+Compares the previous approach, where `Container` built a new repository and service for every request and each
+`get` call built its statement from scratch, with singleton repositories reusing prebuilt statements.
+
+Usage:
+    PYTHONPATH=src python benchmarks/repository_statements.py
+"""
+import timeit
+import uuid
+from contextlib import asynccontextmanager
+
+from dependency_injector import providers
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from hackathon.domain.advocates import Advocate, AdvocateRepository, AdvocateService
+
+NUMBER = 10_000
+
+
+@asynccontextmanager
+async def session_factory():
+    yield None
+
+
+def per_request_statement(id_: uuid.UUID):
+    return select(Advocate).where(Advocate.id == id_).options(
+        joinedload(Advocate.social_account),
+        joinedload(Advocate.company),
+    )
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(f"{name:<40} {before / NUMBER * 1e6:>10.2f} us {after / NUMBER * 1e6:>10.2f} us {before / after:>8.1f}x")
+
+
+def main() -> None:
+    factory = providers.Factory(
+        AdvocateService,
+        repository=providers.Factory(AdvocateRepository, session_factory=session_factory),
+    )
+    singleton = providers.Singleton(
+        AdvocateService,
+        repository=providers.Singleton(AdvocateRepository, session_factory=session_factory),
+    )
+    repository = singleton().repository
+    id_ = uuid.uuid4()
+
+    print(f"{'':<40} {'before':>13} {'after':>13} {'speedup':>9}")
+    report(
+        "service construction",
+        timeit.timeit(factory, number=NUMBER),
+        timeit.timeit(singleton, number=NUMBER),
+    )
+    # compiled SQL is cached by the engine in both cases, but to look it up SQLAlchemy has to compute
+    # the statement's cache key, which is memoized on a reused statement object
+    report(
+        "get(): statement + cache key",
+        timeit.timeit(lambda: per_request_statement(id_)._generate_cache_key(), number=NUMBER),
+        timeit.timeit(lambda: repository._get_statement._generate_cache_key(), number=NUMBER),
+    )
+
+
+if __name__ == "__main__":
+    main()
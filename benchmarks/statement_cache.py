@@ -0,0 +1,62 @@
+"""Query latency with and without server-side prepared statement reuse.
+
+Runs the same `get`-like statement through `Database` configured:
+- directly, with SQLAlchemy's prepared statement cache (default);
+- in pooler mode, with globally unique statement names and the cache (pooler supports prepared statements);
+- in pooler mode without the cache, so every statement is prepared in its transaction (fallback for any pooler).
+
+Requires a database configured by `HOC_DB_*` environment variables with applied migrations.
+
+Usage:
+    PYTHONPATH=src python benchmarks/statement_cache.py
+"""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import bindparam, select
+
+from hackathon.config.settings import get_settings
+from hackathon.domain.advocates import Advocate
+from hackathon.infrastructure.db.postgres import Database
+
+NUMBER = 2_000
+
+MODES = {
+    "direct, cached statements": {"POOLER_MODE": False},
+    "pooler, cached unique statements": {"POOLER_MODE": True},
+    "pooler, uncached statements": {"POOLER_MODE": True, "PREPARED_STATEMENT_CACHE_SIZE": 0},
+}
+
+STATEMENT = select(Advocate).where(Advocate.id == bindparam("id_"))
+
+
+async def run(config_update: dict) -> float:
+    database = Database(get_settings().database.copy(update=config_update))
+    id_ = uuid.uuid4()
+    try:
+        # warm up the pool and caches
+        async with database.session() as session:
+            await session.execute(STATEMENT, {"id_": id_})
+
+        started = time.perf_counter()
+        for _ in range(NUMBER):
+            # one session, i.e. one transaction, per query, as with a request
+            async with database.session() as session:
+                await session.execute(STATEMENT, {"id_": id_})
+        return time.perf_counter() - started
+    finally:
+        await database.engine.dispose()
+
+
+async def main() -> None:
+    baseline = None
+    print(f"{'':<40} {'per query':>13} {'slowdown':>9}")
+    for name, config_update in MODES.items():
+        elapsed = await run(config_update)
+        baseline = baseline or elapsed
+        print(f"{name:<40} {elapsed / NUMBER * 1e6:>10.2f} us {elapsed / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,42 +1,98 @@
+from functools import partial
 from http import HTTPStatus
 from typing import Annotated, Final, Sequence
 from uuid import UUID
 
-from starlite import Controller, Dependency, Partial, Provide, Router, delete, get, patch, post
+from starlite import (
+    Controller, Dependency, Parameter, Partial, Provide, Request, Response, Router, delete, get, patch, post,
+)
 
 from hackathon.containers import Container
-from hackathon.dependencies import SEARCH_FILTER_DEPENDENCY_KEY, search_filter_provider_factory
+from hackathon.dependencies import (
+    ORDER_BY_DEPENDENCY_KEY, SEARCH_FILTER_DEPENDENCY_KEY, order_by_provider_factory, search_filter_provider_factory,
+)
 from hackathon.domain.advocates import (
-    Advocate, AdvocateCreateSchema, AdvocateDetailSchema, AdvocateFullDetailSchema, AdvocateService,
+    Advocate, AdvocateCreateSchema, AdvocateDetailSchema, AdvocateFullDetailSchema, AdvocateRepository, AdvocateService,
     AdvocateShortDetailSchema,
 )
+from hackathon.lib import conditional, streaming
 from hackathon.lib.dependency_injector.ext.starlite import ProvideDI, inject
-from hackathon.lib.repositories.filters import SearchFilter
+from hackathon.lib.pagination import create_pagination_headers
+from hackathon.lib.repositories.filters import Facet, FullTextSearchFilter, OrderBy, SchemaProjection, SearchFilter
 from hackathon.lib.repositories.types import FilterTypes
+from hackathon.lib.schemas import FacetedListSchema
 
 
 class AdvocateController(Controller):
     """Advocates API."""
 
     SEARCH_FIELDS: Final[Sequence[str]] = ["name", "username"]
+    SEARCH_VECTOR_FIELD: Final[str] = "search_vector"
+    SORT_FIELDS: Final[Sequence[str]] = AdvocateRepository.sortable_attributes
+    EXPERIENCE_BUCKETS: Final[Sequence[int]] = [0, 1, 3, 5, 10]
 
     member_path = "{advocate_id:uuid}"
 
     @get(
         dependencies={
-            SEARCH_FILTER_DEPENDENCY_KEY: Provide(search_filter_provider_factory(SEARCH_FIELDS)),
+            SEARCH_FILTER_DEPENDENCY_KEY: Provide(search_filter_provider_factory(SEARCH_FIELDS, SEARCH_VECTOR_FIELD)),
+            ORDER_BY_DEPENDENCY_KEY: Provide(order_by_provider_factory(SORT_FIELDS)),
         },
     )
     @inject
     async def get_advocates(
         self,
-        search_filter: SearchFilter = Dependency(skip_validation=True),
-        filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        request: Request,
+        search_filter: FullTextSearchFilter | SearchFilter = Dependency(skip_validation=True),
+        order_by: OrderBy | None = Dependency(skip_validation=True),
+        filters: list[FilterTypes] = Dependency(skip_validation=True),
+        with_count: bool = Parameter(query="with-count", default=False, required=False),
+        facets: bool = Parameter(query="facets", default=False, required=False),
+        experience_buckets: list[int] | None = Parameter(query="experience-buckets", default=None, required=False),
+        stream: bool = Parameter(query="stream", default=False, required=False), *,
         service: Annotated[AdvocateService, ProvideDI] = ProvideDI[Container.advocate_service],
-    ) -> list[AdvocateShortDetailSchema]:
-        """Get a list of advocates."""
-        filters.append(search_filter)
-        return [AdvocateShortDetailSchema.from_orm(item) for item in await service.list(*filters)]
+    ) -> Response[list[AdvocateShortDetailSchema] | FacetedListSchema[AdvocateShortDetailSchema]]:
+        """Get a list of advocates.
+
+        Total count is returned in `X-Total-Count` header if `with-count` is set.
+        Page can be ordered by one of `SORT_FIELDS` with `sort`, e.g. `sort=-name`.
+
+        If `facets` is set, the page is returned in `items` along with `facets`: numbers of all advocates matching
+        the filters per `company_id` and per range of `years_of_experience`. Ranges start at `experience-buckets`,
+        `EXPERIENCE_BUCKETS` by default.
+
+        The whole collection is streamed, ignoring pagination, as NDJSON if `application/x-ndjson` is accepted
+        or as a chunked JSON array if `stream` is set.
+        """
+        if order_by is not None:
+            filters.append(order_by)
+        filters.extend((search_filter, SchemaProjection(AdvocateShortDetailSchema)))
+        if (media_type := streaming.resolve_stream_media_type(request, stream)) is not None:
+            return streaming.create_streaming_response(service.stream(*filters), AdvocateShortDetailSchema, media_type)
+        total_count = None
+        if with_count:
+            advocates, total_count = await service.list_and_count(*filters)
+        else:
+            advocates = await service.list(*filters)
+        headers = create_pagination_headers(advocates, *filters, total_count=total_count)
+        if not facets:
+            return conditional.create_conditional_response(
+                request,
+                advocates,
+                lambda: [AdvocateShortDetailSchema.from_orm(item) for item in advocates],
+                headers=headers,
+            )
+        # `width_bucket()` requires ascending bounds
+        buckets = sorted(set(experience_buckets or self.EXPERIENCE_BUCKETS))
+        counts = await service.count_facets([Facet("company_id"), Facet("years_of_experience", buckets)], *filters)
+        return conditional.create_conditional_response(
+            request,
+            advocates,
+            lambda: FacetedListSchema.from_counts(
+                [AdvocateShortDetailSchema.from_orm(item) for item in advocates], counts),
+            counts,
+            headers=headers,
+        )
 
     @post()
     @inject
@@ -48,16 +104,47 @@ class AdvocateController(Controller):
         """Create an advocate."""
         return AdvocateDetailSchema.from_orm(await service.create(Advocate.from_dto(data)))
 
+    @post("bulk")
+    @inject
+    async def create_advocates_bulk(
+        self,
+        data: list[AdvocateCreateSchema],
+        upsert: bool = Parameter(query="upsert", default=False, required=False), *,
+        service: Annotated[AdvocateService, ProvideDI] = ProvideDI[Container.advocate_service],
+    ) -> list[AdvocateDetailSchema]:
+        """Create advocates in bulk.
+
+        If `upsert` is set, existing advocates with the same `username` are updated instead.
+        """
+        advocates = [Advocate.from_dto(item) for item in data]
+        if upsert:
+            advocates = await service.upsert_many(advocates)
+        else:
+            advocates = await service.create_many(advocates)
+        return [AdvocateDetailSchema.from_orm(item) for item in advocates]
+
+    @delete(status_code=HTTPStatus.NO_CONTENT)
+    @inject
+    async def delete_advocates(
+        self,
+        delete_filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        service: Annotated[AdvocateService, ProvideDI] = ProvideDI[Container.advocate_service],
+    ) -> None:
+        """Delete all advocates matching the `ids`, `created-*` and `updated-*` filters in one statement."""
+        await service.delete_where(*delete_filters)
+
     @get(member_path)
     @inject
     async def get_advocate(
         self,
+        request: Request,
         advocate_id: UUID, *,
         service: Annotated[AdvocateService, ProvideDI] = ProvideDI[Container.advocate_service],
-    ) -> AdvocateFullDetailSchema:
+    ) -> Response[AdvocateFullDetailSchema]:
         """Get advocate by ID."""
         advocate = await service.get(advocate_id)
-        return AdvocateFullDetailSchema.from_orm(advocate)
+        return conditional.create_conditional_response(
+            request, advocate, partial(AdvocateFullDetailSchema.from_orm, advocate))
 
     @patch(member_path)
     @inject
@@ -1,17 +1,24 @@
+from functools import partial
 from http import HTTPStatus
 from typing import Annotated, Final, Sequence
 from uuid import UUID
 
-from starlite import Controller, Dependency, Partial, Provide, Router, delete, get, patch, post
+from starlite import (
+    Controller, Dependency, Parameter, Partial, Provide, Request, Response, Router, delete, get, patch, post,
+)
 
 from hackathon.containers import Container
-from hackathon.dependencies import SEARCH_FILTER_DEPENDENCY_KEY, search_filter_provider_factory
+from hackathon.dependencies import (
+    ORDER_BY_DEPENDENCY_KEY, SEARCH_FILTER_DEPENDENCY_KEY, order_by_provider_factory, search_filter_provider_factory,
+)
 from hackathon.domain.companies import (
-    Company, CompanyCreateSchema, CompanyDetailSchema, CompanyFullDetailSchema, CompanyService,
-    CompanyShortDetailSchema,
+    Company, CompanyCreateSchema, CompanyDetailSchema, CompanyFullDetailSchema, CompanyRepository, CompanyService,
+    CompanyShortDetailSchema, CompanyStatsSchema, CompanyStatsService,
 )
+from hackathon.lib import conditional, streaming
 from hackathon.lib.dependency_injector.ext.starlite import ProvideDI, inject
-from hackathon.lib.repositories.filters import SearchFilter
+from hackathon.lib.pagination import create_pagination_headers
+from hackathon.lib.repositories.filters import FullTextSearchFilter, OrderBy, SchemaProjection, SearchFilter
 from hackathon.lib.repositories.types import FilterTypes
 
 
@@ -19,24 +26,72 @@ class CompanyController(Controller):
     """Companies API."""
 
     SEARCH_FIELDS: Final[Sequence[str]] = ["name"]
+    SEARCH_VECTOR_FIELD: Final[str] = "search_vector"
+    SORT_FIELDS: Final[Sequence[str]] = CompanyRepository.sortable_attributes
 
     member_path = "{company_id:uuid}"
 
     @get(
         dependencies={
-            SEARCH_FILTER_DEPENDENCY_KEY: Provide(search_filter_provider_factory(SEARCH_FIELDS)),
+            SEARCH_FILTER_DEPENDENCY_KEY: Provide(search_filter_provider_factory(SEARCH_FIELDS, SEARCH_VECTOR_FIELD)),
+            ORDER_BY_DEPENDENCY_KEY: Provide(order_by_provider_factory(SORT_FIELDS)),
         },
     )
     @inject
     async def get_companies(
         self,
-        search_filter: SearchFilter = Dependency(skip_validation=True),
-        filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        request: Request,
+        search_filter: FullTextSearchFilter | SearchFilter = Dependency(skip_validation=True),
+        order_by: OrderBy | None = Dependency(skip_validation=True),
+        filters: list[FilterTypes] = Dependency(skip_validation=True),
+        with_count: bool = Parameter(query="with-count", default=False, required=False),
+        stream: bool = Parameter(query="stream", default=False, required=False), *,
         service: Annotated[CompanyService, ProvideDI] = ProvideDI[Container.company_service],
-    ) -> list[CompanyShortDetailSchema]:
-        """Get a list of companies."""
-        filters.append(search_filter)
-        return [CompanyShortDetailSchema.from_orm(item) for item in await service.list(*filters)]
+    ) -> Response[list[CompanyShortDetailSchema]]:
+        """Get a list of companies.
+
+        Total count is returned in `X-Total-Count` header if `with-count` is set.
+        Page can be ordered by one of `SORT_FIELDS` with `sort`, e.g. `sort=-name`.
+
+        The whole collection is streamed, ignoring pagination, as NDJSON if `application/x-ndjson` is accepted
+        or as a chunked JSON array if `stream` is set.
+        """
+        if order_by is not None:
+            filters.append(order_by)
+        filters.extend((search_filter, SchemaProjection(CompanyShortDetailSchema)))
+        if (media_type := streaming.resolve_stream_media_type(request, stream)) is not None:
+            return streaming.create_streaming_response(service.stream(*filters), CompanyShortDetailSchema, media_type)
+        total_count = None
+        if with_count:
+            companies, total_count = await service.list_and_count(*filters)
+        else:
+            companies = await service.list(*filters)
+        return conditional.create_conditional_response(
+            request,
+            companies,
+            lambda: [CompanyShortDetailSchema.from_orm(item) for item in companies],
+            headers=create_pagination_headers(companies, *filters, total_count=total_count),
+        )
+
+    @get("stats")
+    @inject
+    async def get_companies_stats(
+        self,
+        request: Request,
+        filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        service: Annotated[CompanyStatsService, ProvideDI] = ProvideDI[Container.company_stats_service],
+    ) -> Response[list[CompanyStatsSchema]]:
+        """Get a list of company stats: number of advocates and their average years of experience.
+
+        Stats are kept up to date on every change of advocates, filter by `ids` to get stats of specific companies.
+        """
+        stats = await service.list(*filters)
+        return conditional.create_conditional_response(
+            request,
+            stats,
+            lambda: [CompanyStatsSchema.from_orm(item) for item in stats],
+            headers=create_pagination_headers(stats, *filters),
+        )
 
     @post()
     @inject
@@ -48,15 +103,59 @@ class CompanyController(Controller):
         """Create a company."""
         return CompanyDetailSchema.from_orm(await service.create(Company.from_dto(data)))
 
+    @post("bulk")
+    @inject
+    async def create_companies_bulk(
+        self,
+        data: list[CompanyCreateSchema],
+        upsert: bool = Parameter(query="upsert", default=False, required=False), *,
+        service: Annotated[CompanyService, ProvideDI] = ProvideDI[Container.company_service],
+    ) -> list[CompanyDetailSchema]:
+        """Create companies in bulk.
+
+        If `upsert` is set, existing companies with the same `name` are updated instead.
+        """
+        companies = [Company.from_dto(item) for item in data]
+        if upsert:
+            companies = await service.upsert_many(companies)
+        else:
+            companies = await service.create_many(companies)
+        return [CompanyDetailSchema.from_orm(item) for item in companies]
+
+    @delete(status_code=HTTPStatus.NO_CONTENT)
+    @inject
+    async def delete_companies(
+        self,
+        delete_filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        service: Annotated[CompanyService, ProvideDI] = ProvideDI[Container.company_service],
+    ) -> None:
+        """Delete all companies matching the `ids`, `created-*` and `updated-*` filters in one statement."""
+        await service.delete_where(*delete_filters)
+
     @get(member_path)
     @inject
     async def get_company(
         self,
+        request: Request,
         company_id: UUID, *,
         service: Annotated[CompanyService, ProvideDI] = ProvideDI[Container.company_service],
-    ) -> CompanyFullDetailSchema:
+    ) -> Response[CompanyFullDetailSchema]:
         """Get company by ID."""
-        return CompanyFullDetailSchema.from_orm(await service.get(company_id))
+        company = await service.get(company_id)
+        return conditional.create_conditional_response(
+            request, company, partial(CompanyFullDetailSchema.from_orm, company))
+
+    @get(f"{member_path}/stats")
+    @inject
+    async def get_company_stats(
+        self,
+        request: Request,
+        company_id: UUID, *,
+        service: Annotated[CompanyStatsService, ProvideDI] = ProvideDI[Container.company_stats_service],
+    ) -> Response[CompanyStatsSchema]:
+        """Get company stats by company ID."""
+        stats = await service.get(company_id)
+        return conditional.create_conditional_response(request, stats, partial(CompanyStatsSchema.from_orm, stats))
 
     @patch(member_path)
     @inject
@@ -7,7 +7,9 @@ from starlite import Router, ServiceUnavailableException, get
 
 from hackathon.config.settings import AppSettings, get_settings
 from hackathon.containers import Container
+from hackathon.infrastructure.db.postgres import Database, SlowQuery
 from hackathon.lib.dependency_injector.ext.starlite import ProvideDI, inject
+from hackathon.lib.repositories.caching import CacheStats, LocalCache
 from hackathon.lib.repositories.sqlalchemy import SQLAlchemyRepository
 from hackathon.lib.repositories.types import SessionFactory
 
@@ -34,4 +36,25 @@ async def healthcheck(
     raise HealthCheckFailure("Databases are not ready.")
 
 
-router = Router(path="", tags=["Misc"], route_handlers=[healthcheck])
+@get(settings.api.SLOW_QUERIES_PATH, summary="Slow queries", cache=False, include_in_schema=False)
+@inject
+async def list_slow_queries(db: Annotated[Database, ProvideDI] = ProvideDI[Container.db]) -> list[SlowQuery]:
+    """Returns the latest slow statements of this app instance, available in debug mode only."""
+    return [] if db.slow_queries is None else db.slow_queries.entries
+
+
+@get(settings.api.CACHE_STATS_PATH, summary="Cache stats", cache=False, include_in_schema=False)
+@inject
+async def get_cache_stats(
+    local_cache: Annotated[LocalCache, ProvideDI] = ProvideDI[Container.local_cache],
+    redis_cache_stats: Annotated[CacheStats, ProvideDI] = ProvideDI[Container.redis_cache_stats],
+) -> dict[str, CacheStats]:
+    """Returns hits, misses and evictions of each cache tier of this app instance, available in debug mode only."""
+    return {"local": local_cache.stats, "redis": redis_cache_stats}
+
+
+route_handlers = [healthcheck]
+if settings.app.DEBUG:
+    route_handlers.extend([list_slow_queries, get_cache_stats])
+
+router = Router(path="", tags=["Misc"], route_handlers=route_handlers)
@@ -1,8 +1,9 @@
+from functools import partial
 from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from starlite import Controller, Dependency, Partial, Router, delete, get, patch, post
+from starlite import Controller, Dependency, Parameter, Partial, Request, Response, Router, delete, get, patch, post
 
 from hackathon.containers import Container
 from hackathon.domain.advocates import (
@@ -10,7 +11,10 @@ from hackathon.domain.advocates import (
     SocialAccountShortDetailSchema,
 )
 from hackathon.domain.advocates.schemas import SocialAccountUpdateSchema
+from hackathon.lib import conditional, streaming
 from hackathon.lib.dependency_injector.ext.starlite import ProvideDI, inject
+from hackathon.lib.pagination import create_pagination_headers
+from hackathon.lib.repositories.filters import SchemaProjection
 from hackathon.lib.repositories.types import FilterTypes
 
 
@@ -23,11 +27,34 @@ class SocialAccountController(Controller):
     @inject
     async def get_social_accounts(
         self,
-        filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        request: Request,
+        filters: list[FilterTypes] = Dependency(skip_validation=True),
+        with_count: bool = Parameter(query="with-count", default=False, required=False),
+        stream: bool = Parameter(query="stream", default=False, required=False), *,
         service: Annotated[SocialAccountService, ProvideDI] = ProvideDI[Container.social_account_service],
-    ) -> list[SocialAccountShortDetailSchema]:
-        """Get a list of social accounts."""
-        return [SocialAccountShortDetailSchema.from_orm(item) for item in await service.list(*filters)]
+    ) -> Response[list[SocialAccountShortDetailSchema]]:
+        """Get a list of social accounts.
+
+        Total count is returned in `X-Total-Count` header if `with-count` is set.
+
+        The whole collection is streamed, ignoring pagination, as NDJSON if `application/x-ndjson` is accepted
+        or as a chunked JSON array if `stream` is set.
+        """
+        filters.append(SchemaProjection(SocialAccountShortDetailSchema))
+        if (media_type := streaming.resolve_stream_media_type(request, stream)) is not None:
+            return streaming.create_streaming_response(
+                service.stream(*filters), SocialAccountShortDetailSchema, media_type)
+        total_count = None
+        if with_count:
+            social_accounts, total_count = await service.list_and_count(*filters)
+        else:
+            social_accounts = await service.list(*filters)
+        return conditional.create_conditional_response(
+            request,
+            social_accounts,
+            lambda: [SocialAccountShortDetailSchema.from_orm(item) for item in social_accounts],
+            headers=create_pagination_headers(social_accounts, *filters, total_count=total_count),
+        )
 
     @post()
     @inject
@@ -39,16 +66,47 @@ class SocialAccountController(Controller):
         """Create a social account."""
         return SocialAccountFullDetailSchema.from_orm(await service.create(SocialAccount.from_dto(data)))
 
+    @post("bulk")
+    @inject
+    async def create_social_accounts_bulk(
+        self,
+        data: list[SocialAccountCreateSchema],
+        upsert: bool = Parameter(query="upsert", default=False, required=False), *,
+        service: Annotated[SocialAccountService, ProvideDI] = ProvideDI[Container.social_account_service],
+    ) -> list[SocialAccountFullDetailSchema]:
+        """Create social accounts in bulk.
+
+        If `upsert` is set, existing social accounts with the same advocate are updated instead.
+        """
+        social_accounts = [SocialAccount.from_dto(item) for item in data]
+        if upsert:
+            social_accounts = await service.upsert_many(social_accounts)
+        else:
+            social_accounts = await service.create_many(social_accounts)
+        return [SocialAccountFullDetailSchema.from_orm(item) for item in social_accounts]
+
+    @delete(status_code=HTTPStatus.NO_CONTENT)
+    @inject
+    async def delete_social_accounts(
+        self,
+        delete_filters: list[FilterTypes] = Dependency(skip_validation=True), *,
+        service: Annotated[SocialAccountService, ProvideDI] = ProvideDI[Container.social_account_service],
+    ) -> None:
+        """Delete all social accounts matching the `ids`, `created-*` and `updated-*` filters in one statement."""
+        await service.delete_where(*delete_filters)
+
     @get(member_path)
     @inject
     async def get_social_account(
         self,
+        request: Request,
         social_account_id: UUID, *,
         service: Annotated[SocialAccountService, ProvideDI] = ProvideDI[Container.social_account_service],
-    ) -> SocialAccountFullDetailSchema:
+    ) -> Response[SocialAccountFullDetailSchema]:
         """Get social account by ID."""
         social_account = await service.get(social_account_id)
-        return SocialAccountFullDetailSchema.from_orm(social_account)
+        return conditional.create_conditional_response(
+            request, social_account, partial(SocialAccountFullDetailSchema.from_orm, social_account))
 
     @patch(member_path)
     @inject
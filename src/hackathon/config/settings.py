@@ -42,6 +42,8 @@ class APISettings(BaseSettings):
 
     V1_STR: str = Field("/api/v1")
     HEALTHCHECK_PATH: str = Field("/healthcheck")
+    SLOW_QUERIES_PATH: str = Field("/debug/slow-queries")
+    CACHE_STATS_PATH: str = Field("/debug/cache-stats")
 
     DEFAULT_PAGINATION_LIMIT: int = Field(10)
 
@@ -74,6 +76,34 @@ class DatabaseSettings(BaseSettings):
     PASSWORD: str
     URL: PostgresDsn | None = None
 
+    # Statement caches
+    # asyncpg's own cache, used for statements that are not prepared by SQLAlchemy, e.g. `executemany`
+    STATEMENT_CACHE_SIZE: int = Field(100)
+    # SQLAlchemy's per connection cache of named prepared statements, `0` disables it
+    PREPARED_STATEMENT_CACHE_SIZE: int = Field(100)
+    # Connect through a transaction mode pooler, e.g. PgBouncer, that may switch server connections between
+    # transactions. Statements get globally unique names, reusing cached ones requires pooler support of
+    # protocol-level prepared statements (PgBouncer `max_prepared_statements`). Without it, disable the cache,
+    # so that statements are prepared in the transaction they are executed in.
+    POOLER_MODE: bool = Field(False)
+
+    # Read replicas, reads are balanced between them in round-robin, writes always go to the primary `URL`
+    REPLICA_URLS: list[PostgresDsn] = Field([])
+    # Seconds during which reads are routed to the primary after a write, so that clients see their own changes
+    READ_YOUR_WRITES_SECONDS: float = Field(5)
+
+    # Per request statistics of executed statements, reported in the `Server-Timing` header and logs
+    QUERY_STATS: bool = Field(True)
+    # Statement executed more times within a request is logged as a possible N+1 query
+    QUERY_STATS_REPEAT_THRESHOLD: int = Field(10)
+
+    # Statements running longer, in seconds, are logged and kept in the slow query log, `0` disables the log
+    SLOW_QUERY_SECONDS: float = Field(0.5)
+    # Share of slow `SELECT` statements, whose plans are captured with `EXPLAIN (ANALYZE, BUFFERS)`
+    SLOW_QUERY_EXPLAIN_RATE: float = Field(0.1)
+    # Number of the latest slow statements kept in memory
+    SLOW_QUERY_LOG_SIZE: int = Field(100)
+
     class Config(EnvConfig):
         env_prefix = "HOC_DB_"
         case_sensitive = True
@@ -104,6 +134,16 @@ class RedisSettings(BaseSettings):
     DB: int
     URL: RedisDsn | None = None
 
+    # Cache
+    # Seconds after which cached repository reads expire, bounds staleness of entries missed by invalidation
+    CACHE_TTL_SECONDS: int = Field(300)
+    # Number of `get` results kept in memory of each process, in front of Redis
+    LOCAL_CACHE_SIZE: int = Field(1024)
+    # Seconds after which in-process entries expire, bounds staleness of entries missed by invalidation
+    LOCAL_CACHE_TTL_SECONDS: float = Field(30)
+    # Channel invalidated cache tags are published to, so that every process evicts its in-process entries
+    CACHE_INVALIDATION_CHANNEL: str = Field("cache:invalidations")
+
     class Config(EnvConfig):
         env_prefix = "HOC_REDIS_"
         case_sensitive = True
@@ -3,6 +3,7 @@ from dependency_injector import containers, providers
 from hackathon.config.settings import get_settings
 from hackathon.domain import advocates, companies
 from hackathon.infrastructure.db import postgres, redis
+from hackathon.lib.repositories.caching import CacheStats, CachingRepository, LocalCache
 
 __all__ = ["Container", "override_providers"]
 
@@ -35,40 +36,97 @@ class Container(containers.DeclarativeContainer):
         config=settings.redis,
     )
 
+    # Cache
+
+    local_cache = providers.Singleton(
+        LocalCache,
+        size=settings.redis.LOCAL_CACHE_SIZE,
+        ttl=settings.redis.LOCAL_CACHE_TTL_SECONDS,
+    )
+
+    redis_cache_stats = providers.Singleton(CacheStats)
+
+    cache_invalidation_listener = providers.Resource(
+        redis.init_cache_invalidation_listener,
+        redis_client=redis_connection,
+        cache=local_cache,
+        config=settings.redis,
+    )
+
     # Domain -> Advocates
 
-    social_account_repository = providers.Factory(
-        advocates.SocialAccountRepository,
-        session_factory=db.provided.session,
+    social_account_repository = providers.Singleton(
+        CachingRepository,
+        repository=providers.Singleton(
+            advocates.SocialAccountRepository,
+            session_factory=db.provided.session,
+        ),
+        redis=redis_connection,
+        ttl=settings.redis.CACHE_TTL_SECONDS,
+        get_transaction=db.provided.get_unit_of_work,
+        read_from_primary=db.provided.read_from_primary,
+        local_cache=local_cache,
+        invalidation_channel=settings.redis.CACHE_INVALIDATION_CHANNEL,
+        stats=redis_cache_stats,
     )
 
-    social_account_service = providers.Factory(
+    social_account_service = providers.Singleton(
         advocates.SocialAccountService,
         repository=social_account_repository,
     )
 
-    advocate_repository = providers.Factory(
-        advocates.AdvocateRepository,
-        session_factory=db.provided.session,
+    advocate_repository = providers.Singleton(
+        CachingRepository,
+        repository=providers.Singleton(
+            advocates.AdvocateRepository,
+            session_factory=db.provided.session,
+        ),
+        redis=redis_connection,
+        ttl=settings.redis.CACHE_TTL_SECONDS,
+        get_transaction=db.provided.get_unit_of_work,
+        read_from_primary=db.provided.read_from_primary,
+        local_cache=local_cache,
+        invalidation_channel=settings.redis.CACHE_INVALIDATION_CHANNEL,
+        stats=redis_cache_stats,
     )
 
-    advocate_service = providers.Factory(
+    advocate_service = providers.Singleton(
         advocates.AdvocateService,
         repository=advocate_repository,
     )
 
     # Domain -> Companies
 
-    company_repository = providers.Factory(
-        companies.CompanyRepository,
-        session_factory=db.provided.session,
+    company_repository = providers.Singleton(
+        CachingRepository,
+        repository=providers.Singleton(
+            companies.CompanyRepository,
+            session_factory=db.provided.session,
+        ),
+        redis=redis_connection,
+        ttl=settings.redis.CACHE_TTL_SECONDS,
+        get_transaction=db.provided.get_unit_of_work,
+        read_from_primary=db.provided.read_from_primary,
+        local_cache=local_cache,
+        invalidation_channel=settings.redis.CACHE_INVALIDATION_CHANNEL,
+        stats=redis_cache_stats,
     )
 
-    company_service = providers.Factory(
+    company_service = providers.Singleton(
         companies.CompanyService,
         repository=company_repository,
     )
 
+    company_stats_repository = providers.Singleton(
+        companies.CompanyStatsRepository,
+        session_factory=db.provided.session,
+    )
+
+    company_stats_service = providers.Singleton(
+        companies.CompanyStatsService,
+        repository=company_stats_repository,
+    )
+
 
 def override_providers(container: Container, /) -> Container:
     """Override providers with stubs."""
@@ -2,47 +2,94 @@ import datetime
 import uuid
 from typing import Callable, Final, Sequence, TypeAlias
 
-from starlite import Dependency, Parameter, Provide
+from starlite import Dependency, Parameter, Provide, ValidationException
 
 from hackathon.config.settings import get_settings
-from hackathon.lib.repositories.filters import BeforeAfter, CollectionFilter, LimitOffset, SearchFilter
+from hackathon.lib.pagination import decode_cursor
+from hackathon.lib.repositories.filters import (
+    BeforeAfter, CollectionFilter, FullTextSearchFilter, KeysetCursor, LimitOffset, OrderBy, SearchFilter, SearchMode,
+)
 from hackathon.lib.repositories.types import FilterTypes
 
 DTorNone: TypeAlias = datetime.datetime | None
 
 FILTERS_DEPENDENCY_KEY: Final[str] = "filters"
+DELETE_FILTERS_DEPENDENCY_KEY: Final[str] = "delete_filters"
 CREATED_FILTER_DEPENDENCY_KEY: Final[str] = "created_filter"
 UPDATED_FILTER_DEPENDENCY_KEY: Final[str] = "updated_filter"
 ID_FILTER_DEPENDENCY_KEY: Final[str] = "id_filter"
 SEARCH_FILTER_DEPENDENCY_KEY: Final[str] = "search_filter"
+ORDER_BY_DEPENDENCY_KEY: Final[str] = "order_by"
 LIMIT_OFFSET_DEPENDENCY_KEY: Final[str] = "limit_offset"
+KEYSET_CURSOR_DEPENDENCY_KEY: Final[str] = "keyset_cursor"
 
 settings = get_settings()
 
 
-def search_filter_provider_factory(field_names: Sequence[str]) -> Callable[[str], SearchFilter[uuid.UUID]]:
-    """Build `SearchFilter` provider.
+def search_filter_provider_factory(
+    field_names: Sequence[str],
+    vector_field_name: str,
+) -> Callable[[str, SearchMode | None], FullTextSearchFilter | SearchFilter[uuid.UUID]]:
+    """Build search filter provider.
 
     Args:
-        field_names: Names of model attributes to filter on.
+        field_names: Names of model attributes to filter on in `substring` and `fuzzy` search modes.
+        vector_field_name: Name of the model `tsvector` attribute to filter on in full-text search.
     """
 
     def provide_search_filter(
         q: str | None = Parameter(query="q", default=None, required=False),  # noqa: VNE001
-    ) -> SearchFilter[uuid.UUID]:
-        """Return type consumed by `Repository.filter_like_collection()`.
+        mode: SearchMode | None = Parameter(query="search-mode", default=None, required=False),
+    ) -> FullTextSearchFilter | SearchFilter[uuid.UUID]:
+        """Return type consumed by `Repository.filter_full_text()` or `Repository.filter_like_collection()`.
 
         Args:
-            q: Parsed out of comma separated list of values in query params.
+            q: Search query, full-text search results are ordered by relevance unless paginated with a cursor.
+            mode: Match fragments of values (`substring`) or values similar to the query (`fuzzy`)
+                instead of whole words.
         """
+        if mode is None:
+            return FullTextSearchFilter(field_name=vector_field_name, query=q)
         query = q
         if query is not None:
             query = query.strip()
-        return SearchFilter(field_names=field_names, query=query)
+        return SearchFilter(field_names=field_names, query=query, mode=mode)
 
     return provide_search_filter
 
 
+def order_by_provider_factory(field_names: Sequence[str]) -> Callable[[str], OrderBy | None]:
+    """Build `OrderBy` provider.
+
+    Args:
+        field_names: Names of model attributes that can be ordered by, e.g. `Repository.sortable_attributes`.
+    """
+
+    def provide_order_by(
+        sort: str | None = Parameter(query="sort", default=None, required=False),
+        keyset_cursor: KeysetCursor | None = Dependency(skip_validation=True),
+    ) -> OrderBy | None:
+        """Return type consumed by `Repository.order_by()`.
+
+        Args:
+            sort: Name of the attribute to order by, prefixed with `-` for descending order, e.g. `-name`.
+            keyset_cursor: Keyset pagination filter, pages after a cursor are always in the keyset order.
+
+        Raises:
+            ValidationException: If the collection can't be ordered by the attribute, or a cursor is also provided.
+        """
+        if not sort:
+            return None
+        if keyset_cursor is not None:
+            raise ValidationException("`sort` can't be combined with `cursor`, pages after a cursor are ordered by it.")
+        field_name = sort.removeprefix("-")
+        if field_name not in field_names:
+            raise ValidationException(f"`sort` must be one of: {', '.join(field_names)}.")
+        return OrderBy(field_name, "desc" if sort.startswith("-") else "asc")
+
+    return provide_order_by
+
+
 def provide_id_filter(
     ids: list[uuid.UUID] | None = Parameter(query="ids", default=None, required=False),
 ) -> CollectionFilter[uuid.UUID]:
@@ -55,29 +102,32 @@ def provide_id_filter(
 
 
 def provide_created_filter(
-    before: DTorNone = Parameter(query="created-before", default=None, required=False),
-    after: DTorNone = Parameter(query="created-after", default=None, required=False),
+    created_before: DTorNone = Parameter(query="created-before", default=None, required=False),
+    created_after: DTorNone = Parameter(query="created-after", default=None, required=False),
 ) -> BeforeAfter:
     """Return type consumed by `Repository.filter_on_datetime_field()`.
 
+    Parameter names are unique among the dependencies of a handler, otherwise values of the `updated-*` parameters
+    could be passed here.
+
     Args:
-        before: Filter for records updated before this date/time.
-        after: Filter for records updated after this date/time.
+        created_before: Filter for records created before this date/time.
+        created_after: Filter for records created after this date/time.
     """
-    return BeforeAfter("created_at", before, after)
+    return BeforeAfter("created_at", created_before, created_after)
 
 
 def provide_updated_filter(
-    before: DTorNone = Parameter(query="updated-before", default=None, required=False),
-    after: DTorNone = Parameter(query="updated-after", default=None, required=False),
+    updated_before: DTorNone = Parameter(query="updated-before", default=None, required=False),
+    updated_after: DTorNone = Parameter(query="updated-after", default=None, required=False),
 ) -> BeforeAfter:
     """Return type consumed by `Repository.filter_on_datetime_field()`.
 
     Args:
-        before: Filter for records updated before this date/time.
-        after: Filter for records updated after this date/time.
+        updated_before: Filter for records updated before this date/time.
+        updated_after: Filter for records updated after this date/time.
     """
-    return BeforeAfter("updated_at", before, after)
+    return BeforeAfter("updated_at", updated_before, updated_after)
 
 
 def provide_limit_offset_pagination(
@@ -98,11 +148,35 @@ def provide_limit_offset_pagination(
     return LimitOffset(page_size, page_size * (page - 1))
 
 
+def provide_keyset_pagination(
+    cursor: str | None = Parameter(query="cursor", default=None, required=False),
+    page_size: int = Parameter(
+        query="page-size",
+        ge=1,
+        default=settings.api.DEFAULT_PAGINATION_LIMIT,
+        required=False,
+    ),
+) -> KeysetCursor | None:
+    """Return type consumed by `Repository.apply_keyset_pagination()`.
+
+    Args:
+        cursor: Opaque cursor taken from the `X-Next-Cursor` header of the previous page.
+        page_size: LIMIT to apply to select.
+    """
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, page_size)
+    except ValueError as exc:
+        raise ValidationException("Invalid pagination cursor.") from exc
+
+
 def provide_filter_dependencies(
     created_filter: BeforeAfter = Dependency(skip_validation=True),
     updated_filter: BeforeAfter = Dependency(skip_validation=True),
     id_filter: CollectionFilter = Dependency(skip_validation=True),
     limit_offset: LimitOffset = Dependency(skip_validation=True),
+    keyset_cursor: KeysetCursor | None = Dependency(skip_validation=True),
 ) -> list[FilterTypes]:
     """Common collection route filtering dependencies.
 
@@ -119,14 +193,43 @@ def provide_filter_dependencies(
         created_filter: Filter for scoping query to instance creation date/time.
         updated_filter: Filter for scoping query to instance update date/time.
         limit_offset: Filter for query pagination.
+        keyset_cursor: Filter for keyset pagination, takes precedence over `limit_offset` if provided.
+
+    Returns:
+        List of filters parsed from connection.
+    """
+    return [
+        created_filter,
+        id_filter,
+        limit_offset if keyset_cursor is None else keyset_cursor,
+        updated_filter,
+    ]
+
+
+def provide_delete_filter_dependencies(
+    created_filter: BeforeAfter = Dependency(skip_validation=True),
+    updated_filter: BeforeAfter = Dependency(skip_validation=True),
+    id_filter: CollectionFilter = Dependency(skip_validation=True),
+) -> list[FilterTypes]:
+    """Collection delete route filtering dependencies.
+
+    Args:
+        id_filter: Filter for scoping query to limited set of identities.
+        created_filter: Filter for scoping query to instance creation date/time.
+        updated_filter: Filter for scoping query to instance update date/time.
 
     Returns:
         List of filters parsed from connection.
+
+    Raises:
+        ValidationException: If none of the filters is set, so that the whole collection is never deleted by accident.
     """
+    datetime_filters = (created_filter, updated_filter)
+    if not id_filter.values and all(f.before is None and f.after is None for f in datetime_filters):
+        raise ValidationException("At least one of `ids`, `created-*` or `updated-*` filters is required.")
     return [
         created_filter,
         id_filter,
-        limit_offset,
         updated_filter,
     ]
 
@@ -135,10 +238,12 @@ def create_collection_dependencies() -> dict[str, Provide]:
     """Creates a dictionary of provides for pagination endpoints."""
     return {
         LIMIT_OFFSET_DEPENDENCY_KEY: Provide(provide_limit_offset_pagination),
+        KEYSET_CURSOR_DEPENDENCY_KEY: Provide(provide_keyset_pagination),
         UPDATED_FILTER_DEPENDENCY_KEY: Provide(provide_updated_filter),
         CREATED_FILTER_DEPENDENCY_KEY: Provide(provide_created_filter),
         ID_FILTER_DEPENDENCY_KEY: Provide(provide_id_filter),
         FILTERS_DEPENDENCY_KEY: Provide(provide_filter_dependencies),
+        DELETE_FILTERS_DEPENDENCY_KEY: Provide(provide_delete_filter_dependencies),
     }
 
 
@@ -3,10 +3,11 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, ForeignKey
+from sqlalchemy import CheckConstraint, Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from hackathon.lib import orm
+from hackathon.lib import dto, orm
 
 if TYPE_CHECKING:
     from hackathon.domain.companies.models import Company
@@ -23,12 +24,30 @@ class Advocate(orm.Base):
     long_bio: Mapped[str]
     years_of_experience: Mapped[int]
     photo_url: Mapped[str | None]
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', name || ' ' || username || ' ' || short_bio)", persisted=True),
+        deferred=True,
+        info={"dto": dto.Mode.private},
+    )
 
-    company: Mapped["Company"] = relationship("Company", back_populates="advocates", lazy="subquery")
-    social_account: Mapped["SocialAccount"] = relationship("SocialAccount", back_populates="advocate", uselist=False)
+    company: Mapped["Company"] = relationship("Company", back_populates="advocates", lazy="raise")
+    social_account: Mapped["SocialAccount"] = relationship(
+        "SocialAccount", back_populates="advocate", uselist=False, lazy="raise")
 
     __table_args__ = (
         CheckConstraint("years_of_experience >= 0", name="years_of_experience_non_negative"),
+        Index("ix_advocate_created_at_id", "created_at", "id"),
+        Index("ix_advocate_name_id", "name", "id"),
+        Index("ix_advocate_years_of_experience_id", "years_of_experience", "id"),
+        Index("ix_advocate_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_advocate_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_advocate_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -42,4 +61,8 @@ class SocialAccount(orm.Base):
     youtube: Mapped[str | None]
     twitter: Mapped[str | None]
 
-    advocate: Mapped[Advocate] = relationship("Advocate", back_populates="social_account")
+    advocate: Mapped[Advocate] = relationship("Advocate", back_populates="social_account", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_socialaccount_created_at_id", "created_at", "id"),
+    )
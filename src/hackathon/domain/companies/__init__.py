@@ -1,14 +1,20 @@
-from .models import Company
-from .repositories import CompanyRepository
-from .schemas import CompanyCreateSchema, CompanyDetailSchema, CompanyFullDetailSchema, CompanyShortDetailSchema
-from .services import CompanyService
+from .models import Company, CompanyStats
+from .repositories import CompanyRepository, CompanyStatsRepository
+from .schemas import (
+    CompanyCreateSchema, CompanyDetailSchema, CompanyFullDetailSchema, CompanyShortDetailSchema, CompanyStatsSchema,
+)
+from .services import CompanyService, CompanyStatsService
 
 __all__ = [
     "Company",
+    "CompanyStats",
     "CompanyRepository",
+    "CompanyStatsRepository",
     "CompanyService",
+    "CompanyStatsService",
     "CompanyCreateSchema",
     "CompanyShortDetailSchema",
     "CompanyDetailSchema",
     "CompanyFullDetailSchema",
+    "CompanyStatsSchema",
 ]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import uuid
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Computed, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from hackathon.lib import orm
+from hackathon.lib import dto, orm
 
 if TYPE_CHECKING:
     from hackathon.domain.advocates.models import Advocate
@@ -16,5 +19,43 @@ class Company(orm.Base):
     name: Mapped[str] = mapped_column(index=True, unique=True)
     summary: Mapped[str]
     photo_url: Mapped[str | None]
-
-    advocates: Mapped[list["Advocate"]] = relationship("Advocate", back_populates="company", lazy="subquery")
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', name)", persisted=True),
+        deferred=True,
+        info={"dto": dto.Mode.private},
+    )
+
+    advocates: Mapped[list["Advocate"]] = relationship("Advocate", back_populates="company", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_company_created_at_id", "created_at", "id"),
+        Index("ix_company_name_id", "name", "id"),
+        Index("ix_company_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_company_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
+
+class CompanyStats(orm.Base):
+    """Aggregates of company advocates.
+
+    Stats share `id` with the company, so that they are read by the primary key. They are kept up to date by
+    statement-level triggers of `company` and `advocate` tables, created by migrations, which add the changes of
+    every write to the totals in the same transaction.
+    """
+
+    id: Mapped[uuid.UUID] = mapped_column(  # noqa: VNE003
+        ForeignKey("company.id", ondelete="CASCADE"), primary_key=True, info={"dto": dto.Mode.read_only})
+
+    advocates_count: Mapped[int] = mapped_column(default=0)
+    years_of_experience_total: Mapped[int] = mapped_column(default=0)
+
+    __table_args__ = (
+        Index("ix_companystats_created_at_id", "created_at", "id"),
+    )
+
+    @property
+    def average_years_of_experience(self) -> float | None:
+        if not self.advocates_count:
+            return None
+        return self.years_of_experience_total / self.advocates_count
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import AnyUrl, validator
 
 from hackathon.lib.schemas import BaseOrjsonSchema, OrjsonSchema, Schema
@@ -41,3 +43,11 @@ class CompanyFullDetailSchema(CompanyBaseSchema, Schema):
     @validator("advocates")
     def set_advocates(cls, advocates: list[AdvocateCompanySchema] | None) -> list[AdvocateCompanySchema]:
         return advocates or []
+
+
+class CompanyStatsSchema(Schema):
+    """Company stats."""
+
+    advocates_count: int
+    average_years_of_experience: float | None
+    updated_at: datetime
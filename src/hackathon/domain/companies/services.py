@@ -1,8 +1,12 @@
 from hackathon.lib.services import Service
 
-from .models import Company
-from .repositories import CompanyRepository
+from .models import Company, CompanyStats
+from .repositories import CompanyRepository, CompanyStatsRepository
 
 
 class CompanyService(Service[Company, CompanyRepository]):
     """Service for working with Companies."""
+
+
+class CompanyStatsService(Service[CompanyStats, CompanyStatsRepository]):
+    """Service for reading company statistics."""
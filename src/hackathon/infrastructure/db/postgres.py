@@ -1,26 +1,87 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-from contextlib import asynccontextmanager
+import math
+import random
+import re
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from functools import partial
-from typing import TYPE_CHECKING, Any
-from uuid import UUID
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Final, Iterator
+from uuid import UUID, uuid4
 
+import asyncpg
 from orjson import dumps, loads
 from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine,
+)
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+
+from starlite import Cookie, Request
 
 from hackathon.config.settings import DatabaseSettings
-from hackathon.lib.exceptions import ConflictError
+from hackathon.lib.exceptions import ConflictError, HackathonAPIError
 from hackathon.lib.repositories.exceptions import RepositoryException
 
 if TYPE_CHECKING:
+    from asyncpg.prepared_stmt import PreparedStatement
+    from sqlalchemy import Engine
+
+    from starlite.types import ASGIApp, Message, Receive, Scope, Send
+
     from hackathon.lib.repositories.types import SessionFactory
 
-__all__ = ["Database"]
+__all__ = [
+    "Database",
+    "UnitOfWork",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "SlowQuery",
+    "SlowQueryLog",
+    "ReadYourWritesMiddleware",
+    "UnitOfWorkMiddleware",
+]
+
+logger = logging.getLogger(__name__)
+
+# Cookie with the time until which reads of the client are routed to the primary
+PRIMARY_PINNED_UNTIL_COOKIE: Final[str] = "primary-pinned-until"
+
+# Key of `Session.info` flag that defers commits of the session to its unit of work
+UNIT_OF_WORK_INFO_KEY: Final[str] = "unit_of_work"
+
+# Unix time until which reads of the current request are routed to the primary
+primary_pinned_until: ContextVar[float] = ContextVar("primary_pinned_until", default=0.0)
+
+# Unit of work of the current request
+current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("current_unit_of_work", default=None)
+
+# Key of `Connection.info` value with the start time of the statement being executed
+QUERY_STARTED_INFO_KEY: Final[str] = "query_started"
+
+# Statistics of statements executed within the current request
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+# Savepoint that isolates `EXPLAIN` of a slow statement from the transaction it ran in
+SLOW_QUERY_EXPLAIN_SAVEPOINT: Final[str] = "slow_query_explain"
+
+# Positional bind parameters, e.g. `$1::UUID`, and expanded lists of them, e.g. `IN ($1, $2, $3)`
+_PARAMETERS_PATTERN: Final[re.Pattern] = re.compile(r"\$\d+(?:::\w+)?(?:, \$\d+(?:::\w+)?)*")
+
+# Constants in plan expressions: quoted literals, e.g. `'name'::text`, and numbers, but not parameters like `$1`
+_PLAN_LITERALS_PATTERN: Final[re.Pattern] = re.compile(r"'(?:[^']|'')*'|(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])")
 
 
 def _default(value: Any) -> str:
@@ -62,39 +123,321 @@ def _sqla_on_connect(dbapi_connection: Any, _: Any) -> Any:
     )
 
 
+def _sqla_before_cursor_execute(conn: Any, *_: Any) -> None:
+    conn.info[QUERY_STARTED_INFO_KEY] = time.perf_counter()
+
+
+def _sqla_after_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    started = conn.info.get(QUERY_STARTED_INFO_KEY)
+    query_stats = current_query_stats.get()
+    if started is not None and query_stats is not None:
+        query_stats.record(statement, time.perf_counter() - started)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within a request."""
+
+    # Number of executed statements
+    count: int = 0
+    # Total execution time, in seconds
+    duration: float = 0
+    # Number of executions of each statement shape, i.e. statement with its parameters collapsed
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[_PARAMETERS_PATTERN.sub("?", " ".join(statement.split()))] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times, a sign of an N+1 problem."""
+        return [(shape, count) for shape, count in self.shapes.items() if count > threshold]
+
+    def to_server_timing(self) -> str:
+        """`Server-Timing` header value."""
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+def _redact_plan(plan: Any) -> Any:
+    """Replace constants in expressions of a JSON plan, bound parameter values are inlined in custom plans."""
+    if isinstance(plan, str):
+        return _PLAN_LITERALS_PATTERN.sub("?", plan)
+    if isinstance(plan, list):
+        return [_redact_plan(item) for item in plan]
+    if isinstance(plan, dict):
+        return {key: _redact_plan(value) for key, value in plan.items()}
+    return plan
+
+
+def _redact_parameters(parameters: Any, executemany: bool) -> list[str]:
+    """Replace values of bound parameters with their types, the values may contain personal data."""
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    return [type(value).__name__ for value in parameters or ()]
+
+
+@dataclass
+class SlowQuery:
+    """Statement that ran longer than the slow query threshold."""
+
+    # Statement text, with placeholders of bound parameters
+    statement: str
+    # Types of bound parameters, values are redacted
+    parameters: list[str]
+    # Execution time, in seconds
+    duration: float
+    # Time the statement finished at
+    finished_at: datetime
+    # `EXPLAIN (ANALYZE, BUFFERS)` plan, captured for a sample of `SELECT` statements, constants are redacted
+    plan: list[dict[str, Any]] | None = None
+
+
+class SlowQueryLog:
+    """Bounded log of the latest slow statements.
+
+    Plans of a sample of slow `SELECT` statements are captured by running them again with `EXPLAIN (ANALYZE, BUFFERS)`
+    on the same connection, in a savepoint, so that a failure doesn't break the transaction of the request.
+    Postgres plans the statement with the values of its parameters inlined, so constants are redacted from the plan:
+    a generic plan, which keeps the placeholders, can't be explained with `ANALYZE` before Postgres 16.
+    """
+
+    def __init__(self, threshold: float, explain_rate: float, size: int) -> None:
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self._entries: deque[SlowQuery] = deque(maxlen=size)
+
+    @property
+    def entries(self) -> list[SlowQuery]:
+        """Slow statements, the latest first."""
+        return list(reversed(self._entries))
+
+    def after_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started = conn.info.get(QUERY_STARTED_INFO_KEY)
+        if started is None or (duration := time.perf_counter() - started) < self.threshold:
+            return
+        slow_query = SlowQuery(
+            statement=statement,
+            parameters=_redact_parameters(parameters, executemany),
+            duration=duration,
+            finished_at=datetime.now(timezone.utc),
+        )
+        logger.warning(
+            "Slow query, %.2f ms: %s, parameters: %s", duration * 1000, statement, ", ".join(slow_query.parameters))
+        if not executemany and statement.lstrip()[:6].upper() == "SELECT" and random.random() < self.explain_rate:
+            slow_query.plan = self._explain(conn, statement, parameters)
+        self._entries.append(slow_query)
+
+    @staticmethod
+    def _explain(conn: Any, statement: str, parameters: Any) -> list[dict[str, Any]] | None:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {SLOW_QUERY_EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {SLOW_QUERY_EXPLAIN_SAVEPOINT}")
+                cursor.execute(f"RELEASE SAVEPOINT {SLOW_QUERY_EXPLAIN_SAVEPOINT}")
+        except Exception:
+            logger.exception("Failed to explain a slow query.")
+            return None
+        finally:
+            cursor.close()
+        return _redact_plan(loads(plan) if isinstance(plan, str) else plan)
+
+
+class UniqueStatementNameConnection(asyncpg.Connection):
+    """asyncpg connection that gives prepared statements globally unique names.
+
+    Behind a transaction mode pooler a server connection is shared by many processes, and sequential names
+    generated by asyncpg in each of them (`__asyncpg_stmt_1__`, ...) collide there.
+    """
+
+    async def prepare(self, query: str, *, name: str | None = None, **kwargs: Any) -> PreparedStatement:
+        return await super().prepare(query, name=f"__asyncpg_stmt_{uuid4().hex}__" if name is None else name, **kwargs)
+
+
+class RoutingSession(Session):
+    """Session that sends writes to the primary and balances reads between replicas.
+
+    Database to read from is chosen once per session, so that all reads of the session see the same state.
+    Reads are routed to the primary once the session has written anything and, for `read_your_writes_seconds`
+    after a write, in the whole request, so that clients always see their own changes.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Iterator[Engine] | None = None,
+        read_your_writes_seconds: float = 0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._replicas = replicas
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._read_bind: Engine | None = None
+        self._wrote = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, bind: Engine | None = None, **kwargs: Any) -> Engine:
+        if bind is not None:
+            # following reads of an explicitly bound one, e.g. eager loads, must see the same database
+            self._read_bind = bind
+            return bind
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+            primary_pinned_until.set(time.time() + self._read_your_writes_seconds)
+        if self._wrote:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._read_bind is None:
+            if self._replicas is None or time.time() < primary_pinned_until.get():
+                self._read_bind = super().get_bind(mapper, clause=clause, **kwargs)
+            else:
+                self._read_bind = next(self._replicas)
+        return self._read_bind
+
+    def commit(self) -> None:
+        # changes of a session shared by a unit of work are only flushed, the unit of work commits them once
+        if self.info.get(UNIT_OF_WORK_INFO_KEY):
+            self.flush()
+            return
+        super().commit()
+
+    def merge(self, *args: Any, **kwargs: Any) -> Any:
+        # merge selects the existing row before the flush, it must see the latest committed version
+        self._wrote = True
+        return super().merge(*args, **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        self._read_bind = None
+        self._wrote = False
+
+
+class UnitOfWork:
+    """Session and transaction shared by all repositories within a request.
+
+    Repositories only flush their changes, all of them are committed at once by `commit()`.
+
+    Attributes:
+        after_commit: Callbacks run once the changes are committed, e.g. cache invalidations. Pending callbacks mean
+            the transaction has uncommitted changes.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.session.info[UNIT_OF_WORK_INFO_KEY] = True
+        self.after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    async def commit(self) -> None:
+        self.session.info[UNIT_OF_WORK_INFO_KEY] = False
+        try:
+            await self.session.commit()
+        finally:
+            self.session.info[UNIT_OF_WORK_INFO_KEY] = True
+        callbacks, self.after_commit = self.after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self) -> None:
+        self.after_commit.clear()
+        await self.session.rollback()
+
+
 class Database:
     """SQLAlchemy ORM wrapper."""
 
     def __init__(self, config: DatabaseSettings) -> None:
-        self._engine = create_async_engine(
-            config.URL,
-            echo=config.ECHO,
-            echo_pool=config.ECHO_POOL,
-            json_serializer=partial(dumps, default=_default),
-            max_overflow=config.POOL_MAX_OVERFLOW,
-            pool_size=config.POOL_SIZE,
-            pool_timeout=config.POOL_TIMEOUT,
-            poolclass=NullPool if config.POOL_DISABLE else None,
+        engine_options = {
+            "echo": config.ECHO,
+            "echo_pool": config.ECHO_POOL,
+            "json_serializer": partial(dumps, default=_default),
+            "max_overflow": config.POOL_MAX_OVERFLOW,
+            "pool_size": config.POOL_SIZE,
+            "pool_timeout": config.POOL_TIMEOUT,
+            "poolclass": NullPool if config.POOL_DISABLE else None,
+            "connect_args": self._get_connect_args(config),
+        }
+        self._engine = create_async_engine(config.URL, **engine_options)
+        self._replica_engines = [create_async_engine(url, **engine_options) for url in config.REPLICA_URLS]
+        replicas = None
+        if self._replica_engines:
+            replicas = itertools.cycle([engine.sync_engine for engine in self._replica_engines])
+        self._session_maker = async_sessionmaker(
+            self._engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            replicas=replicas,
+            read_your_writes_seconds=config.READ_YOUR_WRITES_SECONDS,
         )
         self._async_session_factory = async_scoped_session(
-            session_factory=async_sessionmaker(self._engine, expire_on_commit=False, class_=AsyncSession),
+            session_factory=self._session_maker,
             scopefunc=asyncio.current_task,
         )
+        self._query_stats = config.QUERY_STATS
+        self.slow_queries: SlowQueryLog | None = None
+        if config.SLOW_QUERY_SECONDS:
+            self.slow_queries = SlowQueryLog(
+                config.SLOW_QUERY_SECONDS, config.SLOW_QUERY_EXPLAIN_RATE, config.SLOW_QUERY_LOG_SIZE)
 
         self.register_events()
 
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        return self._replica_engines
+
+    @staticmethod
+    def _get_connect_args(config: DatabaseSettings) -> dict[str, Any]:
+        connect_args: dict[str, Any] = {
+            "prepared_statement_cache_size": config.PREPARED_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": config.STATEMENT_CACHE_SIZE,
+        }
+        if config.POOLER_MODE:
+            # asyncpg's own cache names statements sequentially, so it can't be used behind a pooler
+            connect_args["statement_cache_size"] = 0
+            connect_args["connection_class"] = UniqueStatementNameConnection
+        return connect_args
+
     def register_events(self) -> None:
         """Register SQLAlchemy events."""
-        event.listen(self._engine.sync_engine, "connect", _sqla_on_connect)
+        for engine in (self._engine, *self._replica_engines):
+            event.listen(engine.sync_engine, "connect", _sqla_on_connect)
+            if self._query_stats or self.slow_queries is not None:
+                event.listen(engine.sync_engine, "before_cursor_execute", _sqla_before_cursor_execute)
+            if self._query_stats:
+                event.listen(engine.sync_engine, "after_cursor_execute", _sqla_after_cursor_execute)
+            if self.slow_queries is not None:
+                event.listen(engine.sync_engine, "after_cursor_execute", self.slow_queries.after_cursor_execute)
 
     @asynccontextmanager
     async def session(self) -> SessionFactory:
-        session: AsyncSession = self._async_session_factory()
+        unit_of_work = current_unit_of_work.get()
+        session: AsyncSession = self._async_session_factory() if unit_of_work is None else unit_of_work.session
         try:
             yield session
         except IntegrityError as exc:
             await session.rollback()
             raise ConflictError from exc
+        except HackathonAPIError:
+            # API errors don't break the transaction, the unit of work decides whether to commit it
+            if unit_of_work is None:
+                await session.rollback()
+            raise
         except SQLAlchemyError as exc:
             await session.rollback()
             raise RepositoryException(f"An exception occurred: {exc}") from exc
@@ -103,4 +446,161 @@ class Database:
             await session.rollback()
             raise RepositoryException(f"An exception occurred: {exc}") from exc
         finally:
-            await session.close()
+            if unit_of_work is None:
+                await session.close()
+
+    @staticmethod
+    def get_unit_of_work() -> UnitOfWork | None:
+        """Get unit of work of the current request, if any."""
+        return current_unit_of_work.get()
+
+    @staticmethod
+    @contextmanager
+    def read_from_primary() -> Iterator[None]:
+        """Route reads within the context to the primary, in sessions of their own rather than the unit of work's one.
+
+        Reads shared with other clients, e.g. cached ones, mustn't come from a lagging replica. A session of the unit
+        of work may have chosen a replica already, so the unit of work is left out.
+        """
+        pinned_token = primary_pinned_until.set(math.inf)
+        unit_of_work_token = current_unit_of_work.set(None)
+        try:
+            yield
+        finally:
+            current_unit_of_work.reset(unit_of_work_token)
+            primary_pinned_until.reset(pinned_token)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """Share one session and transaction between all `session()` calls within the context.
+
+        Changes are committed on exit, unless an exception is raised or they were already committed or rolled back.
+        """
+        async with self._session_maker() as session:
+            unit_of_work = UnitOfWork(session)
+            token = current_unit_of_work.set(unit_of_work)
+            try:
+                yield unit_of_work
+                await unit_of_work.commit()
+            except BaseException:
+                await unit_of_work.rollback()
+                raise
+            finally:
+                current_unit_of_work.reset(token)
+
+
+class ReadYourWritesMiddleware:
+    """Pin reads of a client to the primary for a while after its writes, across requests.
+
+    The pin is kept in a cookie, so it works regardless of the app instance that serves the next request.
+    """
+
+    def __init__(self, app: ASGIApp, read_your_writes_seconds: float) -> None:
+        self.app = app
+        self.read_your_writes_seconds = read_your_writes_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            pinned_until = float(Request(scope).cookies.get(PRIMARY_PINNED_UNTIL_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0.0
+        token = primary_pinned_until.set(pinned_until)
+
+        async def send_wrapper(message: Message) -> None:
+            # handler runs in the same task, so writes made by it are visible here
+            if message["type"] == "http.response.start" and primary_pinned_until.get() > pinned_until:
+                cookie = Cookie(
+                    key=PRIMARY_PINNED_UNTIL_COOKIE,
+                    value=str(primary_pinned_until.get()),
+                    max_age=int(self.read_your_writes_seconds) + 1,
+                    httponly=True,
+                    samesite="lax",
+                )
+                MutableHeaders(scope=message).append("set-cookie", cookie.to_header(header=""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            primary_pinned_until.reset(token)
+
+
+class UnitOfWorkMiddleware:
+    """Run every request in a unit of work.
+
+    Changes are committed right before the response is sent, so that the client never sees a success response for
+    changes that failed to commit, and rolled back if the response is an error.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        database: Database = scope["app"].state.container.db()
+        async with database.unit_of_work() as unit_of_work:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    if message["status"] < HTTPStatus.BAD_REQUEST:
+                        await unit_of_work.commit()
+                    else:
+                        await unit_of_work.rollback()
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class QueryStatsMiddleware:
+    """Collect statistics of statements executed within a request.
+
+    Number of statements and total time spent on them are reported in the `Server-Timing` header and logged,
+    statement shapes executed more than `repeat_threshold` times are logged as warnings.
+    Batched `get()` queries are shared by several requests and run outside of them, so they are not counted.
+
+    Headers of a streamed response are sent before the statements that produce its body, so they have no
+    `Server-Timing`: only the log has the totals, written once the whole body is sent.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_stats = QueryStats()
+        token = current_query_stats.set(query_stats)
+
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # headers are held until the first part of the body shows whether the response is streamed
+                start_message = message
+                return
+            if start_message is not None:
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    MutableHeaders(scope=start_message).append("server-timing", query_stats.to_server_timing())
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            request = f"{scope['method']} {scope['path']}"
+            logger.info("%s: %d queries in %.2f ms", request, query_stats.count, query_stats.duration * 1000)
+            for shape, count in query_stats.repeated(self.repeat_threshold):
+                logger.warning("%s: statement executed %d times, possible N+1 query: %s", request, count, shape)
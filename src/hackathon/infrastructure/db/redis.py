@@ -1,8 +1,11 @@
+import asyncio
+import contextlib
 from typing import AsyncIterator
 
 import redis.asyncio as aioredis
 
 from hackathon.config.settings import RedisSettings
+from hackathon.lib.repositories.caching import LocalCache
 
 
 async def init_redis(config: RedisSettings) -> AsyncIterator[aioredis.Redis]:
@@ -13,4 +16,18 @@ async def init_redis(config: RedisSettings) -> AsyncIterator[aioredis.Redis]:
         retry_on_timeout=config.RETRY_ON_TIMEOUT,
     )
     yield redis_client
-    await redis_client.close()
+    # clients built from a URL own their pool, but don't close it by default
+    await redis_client.close(close_connection_pool=True)
+
+
+async def init_cache_invalidation_listener(
+    redis_client: aioredis.Redis,
+    cache: LocalCache,
+    config: RedisSettings,
+) -> AsyncIterator[None]:
+    """Evict in-process cache entries invalidated by other processes, until shutdown."""
+    task = asyncio.create_task(cache.listen(redis_client, config.CACHE_INVALIDATION_CHANNEL))
+    yield
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
@@ -7,9 +7,11 @@ __all__ = [
     "logging",
     "openapi",
     "orm",
+    "pagination",
     "repositories",
     "response",
     "schemas",
     "services",
     "static_files",
+    "streaming",
 ]
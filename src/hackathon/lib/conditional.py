@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence
+
+import orjson
+from sqlalchemy import inspect
+from sqlalchemy.orm import MANYTOONE
+
+from . import orm
+from .response import Response
+
+if TYPE_CHECKING:
+    from starlite import Request
+
+__all__ = ["compute_validators", "create_conditional_response"]
+
+
+def compute_validators(
+    content: orm.Base | Sequence[orm.Base],
+    *dependencies: Any,
+) -> tuple[str, datetime | None]:
+    """Compute validators of a representation of instances, without serializing it.
+
+    Representation is identified by `id` and `updated_at` of every instance it contains, including the loaded
+    relationships, in order. Modification time is only known for a single instance whose loaded relationships are
+    all many-to-one: removal of an item from a list or of a one-to-one child doesn't change any `updated_at`.
+
+    Args:
+        content: Instance or page of instances.
+        *dependencies: Anything else the representation depends on, e.g. response headers.
+
+    Returns:
+        Strong entity tag and the last modification time, if known.
+    """
+    versions = []
+    if isinstance(content, orm.Base):
+        many_to_one = _collect_versions(content, versions)
+    else:
+        for instance in content:
+            _collect_versions(instance, versions)
+        many_to_one = False
+    timestamps = [updated_at for *_, updated_at in versions if updated_at is not None]
+    last_modified = max(timestamps) if many_to_one and timestamps else None
+    digest = hashlib.blake2b(orjson.dumps([versions, _normalize(dependencies)], default=str), digest_size=16)
+    return f'"{digest.hexdigest()}"', last_modified
+
+
+def create_conditional_response(
+    request: Request,
+    content: orm.Base | Sequence[orm.Base],
+    serialize: Callable[[], Any],
+    *dependencies: Any,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Build a response with `ETag` and `Last-Modified` headers, or `304 Not Modified` if the client's copy is fresh.
+
+    `If-None-Match` takes precedence over `If-Modified-Since`. `If-Modified-Since` has whole second precision, so it is
+    compared with the exact modification time: a copy from the second of the last modification is considered stale.
+    Not modified responses have no body, so neither serialization nor compression runs for them.
+
+    Args:
+        request: Current request.
+        content: Instance or page of instances the response represents.
+        serialize: Builds response content, called only if the client's copy is stale.
+        *dependencies: Anything else the representation depends on, e.g. facet counts.
+        headers: Response headers, e.g. pagination ones.
+
+    Returns:
+        Full or not modified response.
+    """
+    headers = dict(headers or {})
+    etag, last_modified = compute_validators(content, *dependencies, headers)
+    headers["ETag"] = etag
+    if last_modified is not None:
+        # naive timestamps are stored in UTC
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.replace(microsecond=0), usegmt=True)
+    if _is_fresh(request, etag, last_modified):
+        return Response(None, status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(serialize(), headers=headers)
+
+
+def _collect_versions(instance: orm.Base, versions: list[tuple[str, Any, datetime]]) -> bool:
+    """Collect versions of `instance` and its loaded relationships, return whether all of them are many-to-one."""
+    state = inspect(instance)
+    versions.append((state.mapper.local_table.name, state.dict.get("id"), state.dict.get("updated_at")))
+    many_to_one = True
+    for relationship in state.mapper.relationships:
+        if relationship.key not in state.dict:
+            continue
+        many_to_one &= relationship.direction is MANYTOONE
+        value = state.dict[relationship.key]
+        for item in (value or ()) if relationship.uselist else filter(None, [value]):
+            many_to_one &= _collect_versions(item, versions)
+    return many_to_one
+
+
+def _normalize(value: Any) -> Any:
+    # keys of mappings may be of any type, e.g. facet values, which JSON objects don't support
+    if isinstance(value, Mapping):
+        return [[_normalize(key), _normalize(item)] for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _is_fresh(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if (if_none_match := request.headers.get("if-none-match")) is not None:
+        # weak comparison, as required for `If-None-Match`
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if last_modified is None or (if_modified_since := request.headers.get("if-modified-since")) is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Iterator
+from typing import Any, Iterator, Sequence, TypeVar
 from zoneinfo import ZoneInfo
 
 SLUG_REGEX = re.compile(r"^[-\w]+$")
@@ -8,8 +8,16 @@ TZ_MOSCOW = ZoneInfo("Europe/Moscow")
 
 sentinel: Any = object()
 
+T = TypeVar("T")
+
 
 def resolve_callables(mapping: dict) -> Iterator[tuple[Any, Any]]:
     """Generate key-value pairs from mapping, where values can be `callable` objects."""
     for key, value in mapping.items():
         yield key, value() if callable(value) else value
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Split sequence into consecutive chunks of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
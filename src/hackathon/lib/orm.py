@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, TypeVar
 from uuid import UUID, uuid4
 
@@ -24,6 +24,11 @@ convention = {
 }
 
 
+def utcnow() -> datetime:
+    """Current UTC date/time, naive as stored in `timestamp without time zone` columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 @listens_for(Session, "before_flush")
 def touch_updated_timestamp(session: Session, *_: Any) -> None:
     """Called from SQLAlchemy's `before_flush` event to bump the `updated_at` timestamp on modified instances.
@@ -32,15 +37,15 @@ def touch_updated_timestamp(session: Session, *_: Any) -> None:
         session: The sync `sqlalchemy.orm.Session` instance that underlies the async session.
     """
     for instance in session.dirty:
-        instance.updated_at = datetime.now()
+        instance.updated_at = utcnow()
 
 
 class Base(DeclarativeBase):
     """Base for all SQLAlchemy declarative models.
 
     Attributes:
-        created_at: Date/time of instance creation.
-        updated_at: Date/time of last instance update.
+        created_at: Date/time of instance creation, in UTC.
+        updated_at: Date/time of last instance update, in UTC.
     """
 
     registry = registry(
@@ -49,8 +54,9 @@ class Base(DeclarativeBase):
     )
 
     id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True, info={"dto": dto.Mode.read_only})  # noqa: VNE003
-    created_at: Mapped[datetime] = mapped_column(default=datetime.now, info={"dto": dto.Mode.read_only})
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.now, info={"dto": dto.Mode.read_only})
+    created_at: Mapped[datetime] = mapped_column(default=utcnow, info={"dto": dto.Mode.read_only})
+    # time windows on `created_at` are served by the `(created_at, id)` keyset pagination indexes
+    updated_at: Mapped[datetime] = mapped_column(default=utcnow, index=True, info={"dto": dto.Mode.read_only})
 
     # noinspection PyMethodParameters
     @declared_attr.directive
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Final, Sequence
+
+import orjson
+
+from .repositories.filters import FullTextSearchFilter, KeysetCursor, LimitOffset, OrderBy, SearchFilter, SearchMode
+
+if TYPE_CHECKING:
+    from . import orm
+    from .repositories.types import FilterTypes
+
+__all__ = ["NEXT_CURSOR_HEADER", "TOTAL_COUNT_HEADER", "encode_cursor", "decode_cursor", "create_pagination_headers"]
+
+# Response header with an opaque cursor of the next page
+NEXT_CURSOR_HEADER: Final[str] = "X-Next-Cursor"
+
+# Response header with the total number of items matching the filters
+TOTAL_COUNT_HEADER: Final[str] = "X-Total-Count"
+
+
+def encode_cursor(instance: orm.Base) -> str:
+    """Build an opaque keyset cursor that points right after the given instance.
+
+    Args:
+        instance: Last instance on the current page.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    payload = orjson.dumps([instance.created_at.isoformat(), str(instance.id)])
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, limit: int) -> KeysetCursor:
+    """Parse a cursor built by `encode_cursor()`.
+
+    Args:
+        cursor: Opaque cursor string.
+        limit: Page size.
+
+    Returns:
+        Keyset pagination filter.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        created_at, id_ = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(created_at, str) or not isinstance(id_, str):
+            raise TypeError("Cursor fields must be strings")
+        return KeysetCursor(limit=limit, created_at=datetime.fromisoformat(created_at), id=uuid.UUID(id_))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def create_pagination_headers(
+    items: Sequence[orm.Base],
+    *filters: FilterTypes,
+    total_count: int | None = None,
+) -> dict[str, str]:
+    """Build pagination headers for a page of items.
+
+    Next page cursor is returned only if the page is full, i.e. there may be more rows to fetch, and is ordered by
+    the keyset, i.e. not by the search relevance or `OrderBy`.
+
+    Args:
+        items: Instances on the current page.
+        *filters: Filters the page was fetched with.
+        total_count: Total number of items matching the filters, if requested.
+
+    Returns:
+        Response headers.
+    """
+    headers = {}
+    if total_count is not None:
+        headers[TOTAL_COUNT_HEADER] = str(total_count)
+    limit = next((filter_.limit for filter_ in filters if isinstance(filter_, (LimitOffset, KeysetCursor))), None)
+    reordered = any(_reorders(filter_) for filter_ in filters)
+    if limit is not None and items and len(items) >= limit and not reordered:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1])
+    return headers
+
+
+def _reorders(filter_: FilterTypes) -> bool:
+    match filter_:
+        case OrderBy():
+            return True
+        case FullTextSearchFilter(query=query) | SearchFilter(query=query, mode=SearchMode.fuzzy):
+            return bool(query)
+    return False
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Generic, Sequence, TypeVar
 
 from ..exceptions import NotFoundError
 
 if TYPE_CHECKING:
+    from .filters import Facet
     from .types import FilterTypes
 
 __all__ = ["AbstractRepository"]
@@ -33,6 +34,17 @@ class AbstractRepository(Generic[T], metaclass=ABCMeta):
             The added instance.
         """
 
+    @abstractmethod
+    async def add_many(self, data: list[T]) -> list[T]:
+        """Add all instances from `data` to the collection.
+
+        Args:
+            data: Instances to be added to the collection.
+
+        Returns:
+            The added instances.
+        """
+
     @abstractmethod
     async def delete(self, id_: Any) -> T:
         """Delete instance identified by `id_`.
@@ -47,6 +59,20 @@ class AbstractRepository(Generic[T], metaclass=ABCMeta):
             NotFoundError: If no instance found identified by `id_`.
         """
 
+    @abstractmethod
+    async def delete_where(self, *filters: FilterTypes, **kwargs: Any) -> list[T]:
+        """Delete all instances matching the given filters in one operation.
+
+        Pagination filters are ignored.
+
+        Args:
+            *filters: Types for specific filtering operations.
+            **kwargs: Instance attribute value filters.
+
+        Returns:
+            The deleted instances.
+        """
+
     @abstractmethod
     async def get(self, id_: Any) -> T:
         """Get instance identified by `id_`.
@@ -73,6 +99,53 @@ class AbstractRepository(Generic[T], metaclass=ABCMeta):
             The list of instances, after filtering applied.
         """
 
+    @abstractmethod
+    async def list_and_count(self, *filters: FilterTypes, **kwargs: Any) -> tuple[list[T], int]:
+        """Get a list of instances, optionally filtered, and the total number of instances matching the filters.
+
+        Args:
+            *filters: Types for specific filtering operations.
+            **kwargs: Instance attribute value filters.
+
+        Returns:
+            The list of instances, after filtering applied, and the total count ignoring pagination.
+            The count may be an estimate for large unfiltered collections.
+        """
+
+    @abstractmethod
+    async def count_facets(
+        self,
+        facets: Sequence[Facet],
+        *filters: FilterTypes,
+        **kwargs: Any,
+    ) -> dict[str, dict[Any, int]]:
+        """Count instances matching the filters by values of each facet.
+
+        Pagination filters are ignored.
+
+        Args:
+            facets: Attributes to group instances by.
+            *filters: Types for specific filtering operations.
+            **kwargs: Instance attribute value filters.
+
+        Returns:
+            Number of instances per value, or per range lower bound, of each facet keyed by the attribute name.
+        """
+
+    @abstractmethod
+    def stream(self, *filters: FilterTypes, **kwargs: Any) -> AsyncIterator[T]:
+        """Iterate over instances, optionally filtered, without loading the whole collection into memory.
+
+        Pagination filters are ignored.
+
+        Args:
+            *filters: Types for specific filtering operations.
+            **kwargs: Instance attribute value filters.
+
+        Returns:
+            Async iterator over the instances, after filtering applied.
+        """
+
     @abstractmethod
     async def update(self, data: T) -> T:
         """Update an existing instance with the attribute values present on `data`.
@@ -105,6 +178,17 @@ class AbstractRepository(Generic[T], metaclass=ABCMeta):
             NotFoundError: If no instance found with same identifier as `data`.
         """
 
+    @abstractmethod
+    async def upsert_many(self, data: list[T]) -> list[T]:
+        """Update existing instances with the attribute values present on `data`, create missing ones.
+
+        Args:
+            data: Instances to update existing, or be created.
+
+        Returns:
+            The updated or created instances.
+        """
+
     @staticmethod
     def check_not_found(item_or_none: T | None) -> T:
         """Raise `NotFoundError` if `item_or_none` is `None`.
@@ -131,6 +215,20 @@ class AbstractRepository(Generic[T], metaclass=ABCMeta):
         """
         return getattr(item, cls.id_attribute)
 
+    def normalize_id(self, id_: Any) -> Any:
+        """Return `id_` converted to the type of `self.id_attribute` values, e.g. from a `str` taken from a path.
+
+        Args:
+            id_: Identifier of an item.
+
+        Returns:
+            The identifier of the same type as the values of the attribute named as `self.id_attribute`.
+
+        Raises:
+            NotFoundError: If `id_` can't be converted, i.e. no item may be identified by it.
+        """
+        return id_
+
     @classmethod
     def set_id_attribute_value(cls, id_: Any, item: T) -> Any:
         """Return the `item` after the ID is set to the appropriate attribute.
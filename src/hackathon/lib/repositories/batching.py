@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+__all__ = ["BatchLoader"]
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class BatchLoader(Generic[KeyT, ValueT]):
+    """Collect keys requested concurrently and load them with a single `load_many` call.
+
+    Keys requested within the same event loop iteration, or within `delay` seconds, are loaded in one batch.
+    Concurrent requests of the same key share one future until it is resolved.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[KeyT]], Awaitable[dict[KeyT, ValueT]]],
+        delay: float = 0,
+        normalize_key: Callable[[Any], KeyT] | None = None,
+    ) -> None:
+        """Initialize loader.
+
+        Args:
+            load_many: Coroutine function that loads values of the given keys, missing keys are resolved with `None`.
+            delay: Seconds to wait for more keys before loading the batch.
+            normalize_key: Converts requested keys and keys of loaded values to the same type, e.g. `str` to `UUID`,
+                so that equal keys of different types share a future and find their values.
+        """
+        self._load_many = load_many
+        self._delay = delay
+        self._normalize_key = normalize_key or (lambda key: key)
+        self._futures: dict[KeyT, asyncio.Future[ValueT | None]] = {}
+        self._queue: list[KeyT] = []
+
+    def load(self, key: KeyT) -> asyncio.Future[ValueT | None]:
+        """Get a future resolved with the value of `key`.
+
+        Awaiting callers should `asyncio.shield()` the future, as it may be shared with other callers.
+        """
+        key = self._normalize_key(key)
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        if not self._queue:
+            if self._delay:
+                loop.call_later(self._delay, self._dispatch)
+            else:
+                loop.call_soon(self._dispatch)
+        self._queue.append(key)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        # the batch is shared by many callers, so it mustn't see context (e.g. a transaction) of the first of them
+        asyncio.get_running_loop().create_task(self._load(keys), context=contextvars.Context())
+
+    async def _load(self, keys: list[KeyT]) -> None:
+        try:
+            values = await self._load_many(keys)
+        except Exception as exc:
+            for key in keys:
+                self._resolve(key, exception=exc)
+            return
+        values = {self._normalize_key(key): value for key, value in values.items()}
+        for key in keys:
+            self._resolve(key, value=values.get(key))
+
+    def _resolve(self, key: KeyT, *, value: ValueT | None = None, exception: Exception | None = None) -> None:
+        # the key stays in `_futures` while loading, so that callers requesting it meanwhile share the future
+        future = self._futures.pop(key)
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(value)
@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, ContextManager, Final, Iterable, Protocol, Sequence,
+)
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy import inspect
+from sqlalchemy.orm import MANYTOONE, RelationshipProperty
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..exceptions import NotFoundError
+from .abc import AbstractRepository
+from .batching import BatchLoader
+from .sqlalchemy import ModelT
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from .filters import Facet
+    from .sqlalchemy import SQLAlchemyRepository
+    from .types import FilterTypes
+
+__all__ = ["CacheStats", "CachingRepository", "LocalCache", "Transaction"]
+
+logger = logging.getLogger(__name__)
+
+# Prefix of cache entries and tags
+CACHE_KEY_PREFIX: Final[str] = "cache"
+
+# Seconds to wait before subscribing to cache invalidations again after a failure
+SUBSCRIBE_RETRY_SECONDS: Final[float] = 1
+
+# Parsers of column values that JSON has no type for
+_PARSERS: Final[dict[type, Callable[[Any], Any]]] = {datetime: datetime.fromisoformat, uuid.UUID: uuid.UUID}
+
+
+class Transaction(Protocol):
+    """Transaction writes are made in, e.g. a unit of work.
+
+    Callbacks are run once the transaction is committed, pending ones mean the transaction has uncommitted changes.
+    """
+
+    after_commit: list[Callable[[], Awaitable[None]]]
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache tier."""
+
+    # Number of lookups served by the tier
+    hits: int = 0
+    # Number of lookups the tier had no entry for
+    misses: int = 0
+    # Number of entries dropped by the tier: invalidated, expired, or least recently used ones over the size limit
+    evictions: int = 0
+
+
+class LocalCache:
+    """In-process LRU cache with TTL and tag invalidation.
+
+    Values are shared by all readers of an entry and mustn't be mutated.
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        """Initialize cache.
+
+        Args:
+            size: Maximum number of entries, the least recently used ones are evicted over it.
+            ttl: Seconds after which entries expire.
+        """
+        self.stats = CacheStats()
+        self._size = size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any, frozenset[str]]] = OrderedDict()
+        self._tags: defaultdict[str, set[str]] = defaultdict(set)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._evict(key)
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, tags: Iterable[str]) -> None:
+        if key in self._entries:
+            self._remove(key)
+        tags = frozenset(tags)
+        self._entries[key] = (time.monotonic() + self._ttl, value, tags)
+        for tag in tags:
+            self._tags[tag].add(key)
+        while len(self._entries) > self._size:
+            self._evict(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                self._evict(key)
+
+    def clear(self) -> None:
+        self.stats.evictions += len(self._entries)
+        self._entries.clear()
+        self._tags.clear()
+
+    async def listen(self, redis: Redis, channel: str) -> None:
+        """Invalidate tags published to `channel` by other processes, until cancelled.
+
+        Invalidations published while the subscription is broken are lost, so the cache is cleared on subscribing.
+        The cache is also cleared if a message can't be handled, as its tags are unknown. Errors are logged, and
+        the listener keeps running, otherwise the process would serve stale entries until restarted.
+        """
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(channel)
+                    self.clear()
+                    async for message in pubsub.listen():
+                        self._handle_invalidation(message)
+            except Exception:
+                logger.warning("Subscription to cache invalidations failed.", exc_info=True)
+                await asyncio.sleep(SUBSCRIBE_RETRY_SECONDS)
+
+    def _handle_invalidation(self, message: dict[str, Any]) -> None:
+        try:
+            tags = orjson.loads(message["data"])
+            if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                raise TypeError(f"Expected a list of tags, got {tags!r}")
+            self.invalidate(tags)
+        except Exception:
+            logger.error("Failed to handle cache invalidation %r.", message, exc_info=True)
+            self.clear()
+
+    def _evict(self, key: str) -> None:
+        self.stats.evictions += 1
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+
+class CachingRepository(AbstractRepository[ModelT]):
+    """Repository that caches results of `get` and `list` of a SQLAlchemy repository in Redis.
+
+    Entries are tagged with every instance they contain, including the eager loaded relationships, lists also with
+    the collection tag of the model. Writes invalidate tags of the written instances and of their many-to-one
+    parents, whose entries may embed a collection of them, and the collection tag, as any write may change lists.
+
+    Invalidation of a write made in a transaction is deferred until the transaction is committed, and the
+    transaction bypasses the cache meanwhile, so that it sees its own changes. Entries expire after `ttl` seconds,
+    which bounds staleness of an entry stored by a read that started before a commit and ended after invalidation.
+    Cache misses are loaded within `read_from_primary`, as an entry read from a lagging replica would be served to
+    every client, including the one that has just written, until it expires.
+
+    Results of `get` may also be kept in a `LocalCache` in front of Redis, saving the round trip and decoding. Its
+    invalidations are published to `invalidation_channel`, so that other processes evict their local entries too.
+    Concurrent `get` calls missed by the local cache are looked up with one `MGET`, and Redis cache misses are loaded
+    with one batch of the wrapped repository.
+
+    Cache is best effort: if Redis fails, the error is logged and the wrapped repository is used as is.
+    """
+
+    def __init__(
+        self,
+        repository: SQLAlchemyRepository[ModelT],
+        redis: Redis,
+        ttl: int,
+        get_transaction: Callable[[], Transaction | None] | None = None,
+        read_from_primary: Callable[[], ContextManager[Any]] | None = None,
+        local_cache: LocalCache | None = None,
+        invalidation_channel: str | None = None,
+        stats: CacheStats | None = None,
+    ) -> None:
+        """Initialize repository.
+
+        Args:
+            repository: Repository to cache results of.
+            redis: Redis client.
+            ttl: Seconds after which entries expire.
+            get_transaction: Returns transaction of the current writes, if any.
+            read_from_primary: Returns context in which reads are routed to the primary database.
+            local_cache: In-process cache of `get` results.
+            invalidation_channel: Redis channel invalidated tags are published to.
+            stats: Counters of the Redis tier, may be shared by repositories.
+        """
+        self.repository = repository
+        self.model_type = repository.model_type
+        self._redis = redis
+        self._ttl = ttl
+        self._get_transaction = get_transaction or (lambda: None)
+        self._read_from_primary = read_from_primary or contextlib.nullcontext
+        self._local_cache = local_cache
+        self._invalidation_channel = invalidation_channel
+        self.stats = CacheStats() if stats is None else stats
+        self._collection_tag = f"{CACHE_KEY_PREFIX}:tag:{self.model_type.__tablename__}"
+        self._get_loader: BatchLoader[Any, ModelT] = BatchLoader(self._get_many, normalize_key=self.normalize_id)
+
+    async def add(self, data: ModelT) -> ModelT:
+        instance = await self.repository.add(data)
+        await self._invalidate_instances([instance])
+        return instance
+
+    async def add_many(self, data: list[ModelT]) -> list[ModelT]:
+        instances = await self.repository.add_many(data)
+        await self._invalidate_instances(instances)
+        return instances
+
+    async def delete(self, id_: Any) -> ModelT:
+        instance = await self.repository.delete(id_)
+        await self._invalidate_instances([instance])
+        return instance
+
+    async def delete_where(self, *filters: FilterTypes, **kwargs: Any) -> list[ModelT]:
+        instances = await self.repository.delete_where(*filters, **kwargs)
+        await self._invalidate_instances(instances)
+        return instances
+
+    async def get(self, id_: Any) -> ModelT:
+        if self._in_dirty_transaction():
+            return await self.repository.get(id_)
+        # shared future mustn't be cancelled together with one of its callers
+        return self.check_not_found(await asyncio.shield(self._get_loader.load(id_)))
+
+    async def list(self, *filters: FilterTypes, **kwargs: Any) -> list[ModelT]:
+        if self._in_dirty_transaction():
+            return await self.repository.list(*filters, **kwargs)
+        key = f"{CACHE_KEY_PREFIX}:{self.model_type.__tablename__}:list:{self._digest(filters, kwargs)}"
+        try:
+            entry = await self._redis.get(key)
+        except RedisError:
+            logger.warning("Failed to read cache entry %s.", key, exc_info=True)
+            entry = None
+        if entry is not None:
+            self.stats.hits += 1
+            return [self._load(self.model_type, item) for item in orjson.loads(entry)]
+        self.stats.misses += 1
+        with self._read_from_primary():
+            instances = await self.repository.list(*filters, **kwargs)
+        await self._store({key: instances}, self._collection_tag)
+        return instances
+
+    async def list_and_count(self, *filters: FilterTypes, **kwargs: Any) -> tuple[list[ModelT], int]:
+        return await self.repository.list_and_count(*filters, **kwargs)
+
+    async def count_facets(
+        self,
+        facets: Sequence[Facet],
+        *filters: FilterTypes,
+        **kwargs: Any,
+    ) -> dict[str, dict[Any, int]]:
+        return await self.repository.count_facets(facets, *filters, **kwargs)
+
+    async def stream(self, *filters: FilterTypes, **kwargs: Any) -> AsyncIterator[ModelT]:
+        async for instance in self.repository.stream(*filters, **kwargs):
+            yield instance
+
+    async def update(self, data: ModelT) -> ModelT:
+        instance = await self.repository.update(data)
+        await self._invalidate_instances([instance])
+        return instance
+
+    async def upsert(self, data: ModelT) -> ModelT:
+        instance = await self.repository.upsert(data)
+        await self._invalidate_instances([instance])
+        return instance
+
+    async def upsert_many(self, data: list[ModelT]) -> list[ModelT]:
+        instances = await self.repository.upsert_many(data)
+        await self._invalidate_instances(instances)
+        return instances
+
+    def normalize_id(self, id_: Any) -> Any:
+        return self.repository.normalize_id(id_)
+
+    def _in_dirty_transaction(self) -> bool:
+        # transaction with uncommitted writes must see them, the cache mustn't store them
+        transaction = self._get_transaction()
+        return transaction is not None and bool(transaction.after_commit)
+
+    async def _get_many(self, ids: list[Any]) -> dict[Any, ModelT]:
+        """Load instances batched by `get` calls from the local cache, Redis, and the repository, tier by tier."""
+        instances = {}
+        if self._local_cache is not None:
+            for id_ in ids:
+                if (data := self._local_cache.get(self._get_key(id_))) is not None:
+                    instances[id_] = self._load(self.model_type, data)
+
+        keys = {id_: self._get_key(id_) for id_ in ids if id_ not in instances}
+        try:
+            entries = await self._redis.mget(list(keys.values())) if keys else []
+        except RedisError:
+            logger.warning("Failed to read cache entries %s.", list(keys.values()), exc_info=True)
+            entries = [None] * len(keys)
+        for (id_, key), entry in zip(keys.items(), entries):
+            if entry is None:
+                self.stats.misses += 1
+                continue
+            self.stats.hits += 1
+            data = orjson.loads(entry)
+            instances[id_] = instance = self._load(self.model_type, data)
+            if self._local_cache is not None:
+                self._local_cache.set(key, data, self._collect_tags(instance))
+
+        missing = [id_ for id_ in ids if id_ not in instances]
+        # concurrent calls are batched by the repository into one statement
+        with self._read_from_primary():
+            results = await asyncio.gather(*(self.repository.get(id_) for id_ in missing), return_exceptions=True)
+        fetched = {}
+        for id_, result in zip(missing, results):
+            if isinstance(result, NotFoundError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            fetched[id_] = result
+            if self._local_cache is not None:
+                self._local_cache.set(self._get_key(id_), self._dump(result), self._collect_tags(result))
+        await self._store({self._get_key(id_): instance for id_, instance in fetched.items()})
+        return instances | fetched
+
+    async def _store(self, entries: dict[str, ModelT | list[ModelT]], *tags: str) -> None:
+        if not entries:
+            return
+        pipeline = self._redis.pipeline(transaction=False)
+        for key, result in entries.items():
+            instances = result if isinstance(result, list) else [result]
+            data = [self._dump(item) for item in instances] if isinstance(result, list) else self._dump(result)
+            pipeline.set(key, orjson.dumps(data, default=str), ex=self._ttl)
+            for tag in {*tags, *(tag for instance in instances for tag in self._collect_tags(instance))}:
+                pipeline.sadd(tag, key)
+                pipeline.expire(tag, self._ttl)
+        try:
+            await pipeline.execute()
+        except RedisError:
+            logger.warning("Failed to store cache entries %s.", list(entries), exc_info=True)
+
+    async def _invalidate_instances(self, instances: Iterable[ModelT]) -> None:
+        tags = {self._collection_tag}
+        for instance in instances:
+            state = inspect(instance)
+            tags.add(self._tag(state.mapper, state.dict[self.id_attribute]))
+            for relationship in state.mapper.relationships:
+                if relationship.direction is not MANYTOONE:
+                    continue
+                for local, _ in relationship.local_remote_pairs:
+                    value = state.dict.get(state.mapper.get_property_by_column(local).key)
+                    if value is not None:
+                        tags.add(self._tag(relationship.mapper, value))
+        transaction = self._get_transaction()
+        if transaction is None:
+            await self._invalidate(tags)
+        else:
+            transaction.after_commit.append(partial(self._invalidate, tags))
+
+    async def _invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        if self._local_cache is not None:
+            self._local_cache.invalidate(tags)
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for tag in tags:
+                pipeline.smembers(tag)
+            keys = set().union(*await pipeline.execute())
+            pipeline.delete(*keys, *tags)
+            if self._invalidation_channel is not None:
+                pipeline.publish(self._invalidation_channel, orjson.dumps(tags))
+            await pipeline.execute()
+            self.stats.evictions += len(keys)
+        except RedisError:
+            logger.error("Failed to invalidate cache tags %s.", tags, exc_info=True)
+
+    @classmethod
+    def _collect_tags(cls, instance: Any) -> Iterable[str]:
+        state = inspect(instance)
+        yield cls._tag(state.mapper, state.identity[0] if state.identity else state.dict.get("id"))
+        for relationship in state.mapper.relationships:
+            value = state.dict.get(relationship.key)
+            for item in (value or ()) if relationship.uselist else filter(None, [value]):
+                yield from cls._collect_tags(item)
+
+    def _get_key(self, id_: Any) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.model_type.__tablename__}:get:{id_}"
+
+    @staticmethod
+    def _tag(mapper: Any, id_: Any) -> str:
+        return f"{CACHE_KEY_PREFIX}:tag:{mapper.local_table.name}:{id_}"
+
+    @staticmethod
+    def _digest(filters: Sequence[FilterTypes], kwargs: dict[str, Any]) -> str:
+        def default(value: Any) -> Any:
+            if isinstance(value, type):
+                return f"{value.__module__}.{value.__qualname__}"
+            return str(value)
+
+        normalized = orjson.dumps(
+            [[[type(filter_).__name__, filter_] for filter_ in filters], kwargs],
+            default=default,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(normalized, digest_size=16).hexdigest()
+
+    @classmethod
+    def _dump(cls, instance: Any) -> dict[str, Any]:
+        state = inspect(instance)
+        data = {}
+        for attribute in state.mapper.attrs:
+            if attribute.key not in state.dict:
+                continue
+            value = state.dict[attribute.key]
+            if isinstance(attribute, RelationshipProperty) and value is not None:
+                value = [cls._dump(item) for item in value] if attribute.uselist else cls._dump(value)
+            data[attribute.key] = value
+        return data
+
+    @classmethod
+    def _load(cls, model_type: type, data: dict[str, Any]) -> Any:
+        mapper = inspect(model_type)
+        # instance is built without events, as if it was loaded from the database, with the cached attributes only
+        instance = mapper.class_manager.new_instance()
+        for key, value in data.items():
+            attribute = mapper.attrs[key]
+            if isinstance(attribute, RelationshipProperty):
+                target = attribute.mapper.class_
+                if attribute.uselist:
+                    value = [cls._load(target, item) for item in value or ()]
+                elif value is not None:
+                    value = cls._load(target, value)
+            elif isinstance(value, str) and (parser := _PARSERS.get(attribute.columns[0].type.python_type)) is not None:
+                value = parser(value)
+            set_committed_value(instance, key, value)
+        return instance
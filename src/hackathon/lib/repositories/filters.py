@@ -1,7 +1,10 @@
 from collections import abc
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Generic, Sequence, TypeVar
+from enum import Enum
+from typing import Any, Generic, Literal, Sequence, TypeVar
+
+from pydantic import BaseModel
 
 T = TypeVar("T")
 
@@ -31,9 +34,19 @@ class CollectionFilter(Generic[T]):
     values: abc.Collection[T]
 
 
+class SearchMode(str, Enum):
+    """How `SearchFilter` matches the query, both modes are served by `pg_trgm` indexes."""
+
+    # Fragment of the value, `ILIKE '%query%'`
+    substring = "substring"
+
+    # Value similar to the query, e.g. with a typo, results are ordered by `similarity()`
+    fuzzy = "fuzzy"
+
+
 @dataclass
 class SearchFilter(Generic[T]):
-    """Data required to construct a `WHERE ... LIKE %...%` clause."""
+    """Data required to construct a `WHERE ... LIKE %...%` or a trigram similarity clause."""
 
     # Names of model attribute to filter on
     field_names: Sequence[str]
@@ -41,6 +54,20 @@ class SearchFilter(Generic[T]):
     # Search query for `LIKE` clause
     query: str
 
+    # How the query is matched
+    mode: SearchMode = SearchMode.substring
+
+
+@dataclass
+class FullTextSearchFilter:
+    """Data required to construct a `WHERE ... @@ to_tsquery(...)` clause ordered by `ts_rank`."""
+
+    # Name of the model `tsvector` attribute to search in
+    field_name: str
+
+    # Search query, every word of it is matched as a prefix
+    query: str | None
+
 
 @dataclass
 class LimitOffset:
@@ -51,3 +78,47 @@ class LimitOffset:
 
     # Value for `OFFSET` clause of query
     offset: int
+
+
+@dataclass
+class KeysetCursor:
+    """Data required to add keyset (seek) pagination to a query ordered by `(created_at, id)`."""
+
+    # Value for `LIMIT` clause of query
+    limit: int
+
+    # `created_at` of the last row on the previous page, `None` for the first page
+    created_at: datetime | None = None
+
+    # `id` of the last row on the previous page, `None` for the first page
+    id: Any | None = None  # noqa: VNE003
+
+
+@dataclass
+class OrderBy:
+    """Data required to order a query by a column, with `id` as a tiebreaker."""
+
+    # Name of the model attribute to order by
+    field_name: str
+
+    # Sort direction, applies to the tiebreaker too, so that both can be read from one index
+    sort_order: Literal["asc", "desc"] = "asc"
+
+
+@dataclass
+class Facet:
+    """Data required to count instances grouped by values of a column, or by ranges of them."""
+
+    # Name of the model attribute to group by
+    field_name: str
+
+    # Ascending lower bounds of the ranges to group values into, each range ends at the next bound
+    buckets: Sequence[Any] | None = None
+
+
+@dataclass
+class SchemaProjection:
+    """Data required to load only the columns and relationships serialized by a response schema."""
+
+    # Pydantic schema the loaded instances are serialized with
+    schema: type[BaseModel]
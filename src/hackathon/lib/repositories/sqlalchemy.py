@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-from collections import abc
-from typing import TYPE_CHECKING, Any, Literal, Sequence, TypeVar
-
-from sqlalchemy import or_, select, text
-from sqlalchemy.engine import Result
-
+import asyncio
+from collections import abc, defaultdict
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Mapping, Sequence, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import any_, bindparam, cast, delete, func, inspect, literal, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, TSQUERY, Insert, insert
+from sqlalchemy.orm import defer, joinedload, load_only, raiseload, selectinload
+
+from ..exceptions import NotFoundError
+from ..helpers import chunked
+from ..orm import utcnow
 from .abc import AbstractRepository
-from .filters import BeforeAfter, CollectionFilter, LimitOffset, SearchFilter
+from .batching import BatchLoader
+from .exceptions import RepositoryException
+from .filters import (
+    BeforeAfter, CollectionFilter, Facet, FullTextSearchFilter, KeysetCursor, LimitOffset, OrderBy, SchemaProjection,
+    SearchFilter, SearchMode,
+)
 
 if TYPE_CHECKING:
-    from datetime import datetime
-
-    from sqlalchemy import Select
+    from sqlalchemy import Delete, Engine, Select
     from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute, Load
+    from sqlalchemy.orm.interfaces import LoaderOption
+    from sqlalchemy.sql.dml import UpdateBase
 
     from .. import orm
     from .types import FilterTypes, SessionFactory
@@ -25,13 +39,49 @@ __all__ = [
 
 T = TypeVar("T")
 ModelT = TypeVar("ModelT", bound="orm.Base")
+DMLT = TypeVar("DMLT", bound="UpdateBase")
+
+PAGINATION_TYPES = (LimitOffset, KeysetCursor)
+
+# Planner's estimate of the number of rows in a table, `-1` if the table has never been analyzed
+ESTIMATE_COUNT_STATEMENT = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)")
 
 
 class SQLAlchemyRepository(AbstractRepository[ModelT]):
-    """SQLAlchemy based repository."""
+    """SQLAlchemy based repository.
+
+    Repository doesn't keep any per-call state: every method builds its statement from the immutable `self._select`,
+    so a single instance can be safely shared between concurrent requests. Statements of a fixed shape are built
+    once, with bound parameters in place of values, and reused, so that SQLAlchemy's compiled cache is always hit.
+    """
 
     model_type: type[ModelT]
 
+    # Names of unique attributes used as a conflict target by `upsert_many`
+    upsert_conflict_attributes: Sequence[str] = ("id",)
+
+    # Max number of rows sent in a single multi-row `INSERT`
+    bulk_chunk_size: int = 1000
+
+    # Number of rows fetched from the server-side cursor at a time by `stream`
+    stream_yield_per: int = 1000
+
+    # Seconds to wait for more concurrent `get` calls to load them in one statement, `None` disables batching
+    get_batch_delay: float | None = 0
+
+    # Relationships eager loaded by each operation, `get` or `list`, as dotted paths, e.g. `{"get": ("books.author",)}`.
+    # Relationships are declared with `lazy="raise"`, so the ones outside of the plan can't be loaded by accident.
+    loading_plans: Mapping[str, Sequence[str]] = {}
+
+    # Attributes `OrderBy` filter may order by, each needs an index on `(attribute, id)` to be read in order
+    sortable_attributes: Sequence[str] = ()
+
+    # Text search configuration the `tsvector` columns of the model are built with
+    search_config: str = "simple"
+
+    # Unfiltered tables estimated to have at least this many rows are counted with the planner's estimate
+    count_estimate_threshold: int = 10_000
+
     def __init__(
         self,
         session_factory: SessionFactory,
@@ -39,89 +89,260 @@ class SQLAlchemyRepository(AbstractRepository[ModelT]):
     ) -> None:
         self._session_factory = session_factory
         self._select = select(self.model_type) if select_ is None else select_
+        self._check_sortable_attributes()
+
+        self._loading_options = {
+            operation: [self._build_loading_option(path) for path in paths]
+            for operation, paths in self.loading_plans.items()
+        }
+
+        # instances returned by writes have the same columns as loaded ones, without deferred ones, e.g. `tsvector`s
+        self._returning_options = [
+            defer(getattr(self.model_type, attribute.key))
+            for attribute in inspect(self.model_type).column_attrs if attribute.deferred
+        ]
+        id_column = getattr(self.model_type, self.id_attribute)
+        self._id_type = id_column.type.python_type
+        get_select = self._apply_loading_plan(self._select, "get")
+        self._get_statement = self.before_get_execute(get_select.where(id_column == bindparam("id_")))
+        self._get_many_statement = self.before_get_execute(
+            get_select.where(id_column == any_(bindparam("ids", type_=ARRAY(id_column.type)))))
+        self._get_loaders: dict[Engine, BatchLoader[Any, ModelT]] = {}
+        self._delete_statement: Delete = (
+            self._returning(delete(self.model_type).where(id_column == bindparam("id_")))
+        )
+        self._insert_statement = self._build_insert_statement()
+        self._upsert_statements: dict[frozenset[str], Insert] = {}
+        self._projections: dict[type[BaseModel], list[LoaderOption]] = {}
 
     async def add(self, data: ModelT) -> ModelT:
-        async with self._session_factory() as session:
-            instance = await self._attach_to_session(session, model=data)
-            await session.refresh(instance)
-            session.expunge(instance)
-            return instance
+        # instance is populated from `RETURNING`, there is no need to refresh it
+        instances = await self._insert_many((self._insert_statement, [self._to_row(data)]))
+        return instances[0]
+
+    async def add_many(self, data: list[ModelT]) -> list[ModelT]:
+        return await self._insert_many((self._insert_statement, [self._to_row(item) for item in data]))
 
     async def delete(self, id_: Any) -> ModelT:
         async with self._session_factory() as session:
-            instance = await self.get(id_)
-            await session.delete(instance)
+            instance = self.check_not_found((await session.scalars(self._delete_statement, {"id_": id_})).one_or_none())
             await session.commit()
             session.expunge(instance)
             return instance
 
+    async def delete_where(self, *filters: FilterTypes, **kwargs: Any) -> list[ModelT]:
+        whereclause = self._apply_filters(self._select, *filters, **kwargs).whereclause
+        if whereclause is None:
+            raise RepositoryException("Refusing to delete all instances, at least one filter is required.")
+        statement = self._returning(delete(self.model_type).where(whereclause))
+        async with self._session_factory() as session:
+            instances = list(await session.scalars(statement))
+            await session.commit()
+            for instance in instances:
+                session.expunge(instance)
+            return instances
+
     async def get(self, id_: Any) -> ModelT:
         async with self._session_factory() as session:
-            self._filter_select_by_kwargs(**{self.id_attribute: id_})
-            self.before_get_execute(session, id_)
-            instance = (await self._execute(session)).scalar_one_or_none()
-            instance = self.check_not_found(instance)
-            session.expunge(instance)
-            return instance
+            # a session in a transaction may have uncommitted changes, only it can see them
+            if self.get_batch_delay is None or session.in_transaction():
+                instance = (await session.execute(self._get_statement, {"id_": id_})).scalar_one_or_none()
+                instance = self.check_not_found(instance)
+                session.expunge(instance)
+                return instance
+            # calls are batched per database they would read from, e.g. a replica or the primary
+            bind = session.get_bind(clause=self._get_statement)
+        if bind not in self._get_loaders:
+            self._get_loaders[bind] = BatchLoader(
+                partial(self._get_many, bind), self.get_batch_delay, normalize_key=self.normalize_id)
+        # shared future mustn't be cancelled together with one of its callers
+        return self.check_not_found(await asyncio.shield(self._get_loaders[bind].load(id_)))
 
     async def list(self, *filters: FilterTypes, **kwargs: Any) -> list[ModelT]:
-        for filter_ in filters:
-            match filter_:
-                case LimitOffset(limit, offset):
-                    self._apply_limit_offset_pagination(limit, offset)  # noqa: F821
-                case BeforeAfter(field_name, before, after):
-                    self._filter_on_datetime_field(field_name, before, after)  # noqa: F821
-                case CollectionFilter(field_name, values):
-                    self._filter_in_collection(field_name, values)  # noqa: F821
-                case SearchFilter(field_names, query):
-                    self._filter_like_collection(field_names, query)  # noqa: F821
-        self._filter_select_by_kwargs(**kwargs)
+        statement = self._apply_filters(self._apply_loading_plan(self._select, "list"), *filters, **kwargs)
+        statement = self.before_list_execute(statement, *filters, **kwargs)
 
         async with self._session_factory() as session:
-            self.before_list_execute(session, *filters, **kwargs)
-            result = await self._execute(session)
-            instances = list(result.scalars())
+            instances = list(await session.scalars(statement))
             for instance in instances:
                 session.expunge(instance)
             return instances
 
+    async def list_and_count(self, *filters: FilterTypes, **kwargs: Any) -> tuple[list[ModelT], int]:
+        statement = self._apply_filters(self._apply_loading_plan(self._select, "list"), *filters, **kwargs)
+        statement = self.before_list_execute(statement, *filters, **kwargs)
+        # the same filters without pagination define the set to be counted
+        counted = self._apply_filters(
+            self._select, *(filter_ for filter_ in filters if not isinstance(filter_, PAGINATION_TYPES)), **kwargs)
+
+        async with self._session_factory() as session:
+            count = None
+            if counted.whereclause is None:
+                count = await self._estimate_count(session)
+            # window can't see rows before the keyset cursor
+            if count is None and not any(isinstance(filter_, KeysetCursor) and filter_.id for filter_ in filters):
+                rows = (await session.execute(statement.add_columns(func.count().over()))).all()
+                instances = [instance for instance, _ in rows]
+                count = rows[0][1] if rows else None
+            else:
+                instances = list(await session.scalars(statement))
+            if count is None:
+                count = await session.scalar(select(func.count()).select_from(counted.subquery()))
+            for instance in instances:
+                session.expunge(instance)
+            return instances, count
+
+    async def count_facets(
+        self,
+        facets: Sequence[Facet],
+        *filters: FilterTypes,
+        **kwargs: Any,
+    ) -> dict[str, dict[Any, int]]:
+        """Count instances matching the filters by values of each facet.
+
+        All facets are counted by one statement with `GROUPING SETS`, so the filtered rows are read once. Ranges of
+        a facet with buckets are numbered by `width_bucket()`, values below the first bound are counted under `None`.
+        Values are ordered by count, ranges by their bounds.
+        """
+        # rows are only counted, so they needn't be ordered or loaded
+        ignored = (*PAGINATION_TYPES, OrderBy, SchemaProjection)
+        filters = tuple(filter_ for filter_ in filters if not isinstance(filter_, ignored))
+        filtered = self._apply_filters(self._select, *filters, **kwargs)
+        filtered = filtered.with_only_columns(*map(self._facet_column, facets)).order_by(None).subquery()
+        columns = list(filtered.c)
+        statement = (
+            select(*map(func.grouping, columns), *columns, func.count())
+            .group_by(func.grouping_sets(*columns))
+            .order_by(func.count().desc())
+        )
+
+        counts = {facet.field_name: dict.fromkeys(facet.buckets or (), 0) for facet in facets}
+        async with self._session_factory() as session:
+            for row in await session.execute(statement):
+                # every row is a group of one facet, the only one not aggregated over
+                index = row[:len(facets)].index(0)
+                facet, value = facets[index], row[len(facets) + index]
+                if facet.buckets is not None:
+                    value = facet.buckets[value - 1] if value else None
+                counts[facet.field_name][value] = row[-1]
+        return counts
+
+    async def stream(self, *filters: FilterTypes, **kwargs: Any) -> AsyncIterator[ModelT]:
+        """Iterate over instances fetched from a server-side cursor in `stream_yield_per` batches, in keyset order.
+
+        Eager loaders of `before_list_execute` must be compatible with `yield_per`, i.e. selectin or many-to-one
+        joined loading, as the ones of the loading plan and the filters are.
+        """
+        filters = tuple(filter_ for filter_ in filters if not isinstance(filter_, PAGINATION_TYPES))
+        statement = self._apply_filters(self._apply_loading_plan(self._select, "list"), *filters, **kwargs)
+        # relevance ordering of search filters is replaced, so that rows come in the index order without a sort
+        statement = statement.order_by(None).order_by(*self._keyset_columns())
+        statement = self.before_list_execute(statement, *filters, **kwargs)
+        statement = statement.execution_options(yield_per=self.stream_yield_per)
+
+        async with self._session_factory() as session:
+            result = await session.stream_scalars(statement)
+            async for partition in result.partitions():
+                # expunged instances are released with the partition, so memory doesn't grow with the collection
+                for instance in partition:
+                    session.expunge(instance)
+                    yield instance
+
     async def update(self, data: ModelT) -> ModelT:
+        id_ = self.get_id_attribute_value(data)
+        statement = self._returning(
+            update(self.model_type)
+            .where(getattr(self.model_type, self.id_attribute) == id_)
+            .values(**self._get_set_values(data), updated_at=utcnow()),
+        )
         async with self._session_factory() as session:
-            id_ = self.get_id_attribute_value(data)
-            # this will raise for not found, and will put the item in the session
-            await self.get(id_)
-            # this will merge the inbound data to the instance we've just put in the session
-            instance = await self._attach_to_session(session, model=data, strategy="merge")
-            await session.refresh(instance)
+            # only attributes set on `data` are sent, zero returned rows means there is no such instance
+            instance = self.check_not_found((await session.scalars(statement)).one_or_none())
+            await session.commit()
             session.expunge(instance)
             return instance
 
     async def upsert(self, data: ModelT) -> ModelT:
+        row = self._to_row(data)
+        required_columns = [
+            column for column in self.model_type.__table__.columns
+            if not column.nullable and column.default is None and column.computed is None
+        ]
+        if any(row.get(column.key) is None for column in required_columns):
+            # instance can't be inserted without required values, so it may only be an update of an existing one
+            return await self.update(data)
+        statement = insert(self.model_type).values(**row)
+        # only attributes set on `data` overwrite an existing instance
+        updated_keys = {*self._get_set_values(data), "updated_at"} - {"created_at"}
+        statement = self._returning(statement.on_conflict_do_update(
+            index_elements=[self.id_attribute],
+            set_={key: statement.excluded[key] for key in updated_keys},
+        ))
         async with self._session_factory() as session:
-            instance = await self._attach_to_session(session, model=data, strategy="merge")
-            await session.refresh(instance)
+            instance = (await session.scalars(statement)).one()
+            await session.commit()
             session.expunge(instance)
             return instance
 
-    def before_get_execute(self, session: AsyncSession, id_: Any) -> None:
-        """Perform an action before executing `get` method.
+    async def upsert_many(self, data: list[ModelT]) -> list[ModelT]:
+        rows = {}
+        for item in data:
+            row = self._to_row(item)
+            # Postgres can't update the same row twice in one statement, so the last duplicate wins
+            key = tuple(row.get(attribute) for attribute in self.upsert_conflict_attributes)
+            rows[key if None not in key else id(row)] = (row, frozenset(self._get_set_values(item)))
+        # only attributes set on an item overwrite an existing instance, items with the same ones share a statement
+        items = list(rows.values())
+        groups: defaultdict[frozenset[str], list[int]] = defaultdict(list)
+        for position, (_, updated_keys) in enumerate(items):
+            groups[updated_keys].append(position)
+        instances = await self._insert_many(*(
+            (self._get_upsert_statement(updated_keys), [items[position][0] for position in positions])
+            for updated_keys, positions in groups.items()
+        ))
+        # instances are returned group by group, restore the order of the items
+        positions = [position for group in groups.values() for position in group]
+        return [instance for _, instance in sorted(zip(positions, instances), key=lambda pair: pair[0])]
+
+    def normalize_id(self, id_: Any) -> Any:
+        if isinstance(id_, self._id_type):
+            return id_
+        try:
+            return self._id_type(id_)
+        except (TypeError, ValueError) as exc:
+            raise NotFoundError("No item found when one was expected") from exc
+
+    def before_get_execute(self, statement: Select[tuple[ModelT]]) -> Select[tuple[ModelT]]:
+        """Customize the statement executed by `get` method.
+
+        Called once on repository initialization, the returned statement is reused by every `get` call.
+        Relationships of the `get` loading plan are already eager loaded.
 
         For example:
             ```python
-            def before_get_execute(self, id_: Any) -> None:
-                self._session = self._session.options(selectinload(Author.books))
+            def before_get_execute(self, statement: Select) -> Select:
+                return statement.options(selectinload(Author.books))
             ```
         """
+        return statement
 
-    def before_list_execute(self, session: AsyncSession, *filters: FilterTypes, **kwargs: Any) -> None:
-        """Perform an action before executing `list` method.
+    def before_list_execute(
+        self,
+        statement: Select[tuple[ModelT]],
+        *filters: FilterTypes,
+        **kwargs: Any,
+    ) -> Select[tuple[ModelT]]:
+        """Customize the statement executed by `list` method.
+
+        Relationships of the `list` loading plan are already eager loaded.
 
         For example:
             ```python
-            def before_list_execute(self, *filters: "FilterTypes", **kwargs: Any) -> None:
-                self._session = self._session.options(selectinload(Author.books))
+            def before_list_execute(self, statement: Select, *filters: FilterTypes, **kwargs: Any) -> Select:
+                return statement.options(selectinload(Author.books))
             ```
         """
+        return statement
 
     @classmethod
     async def check_health(cls, session_factory: SessionFactory) -> bool:
@@ -138,56 +359,295 @@ class SQLAlchemyRepository(AbstractRepository[ModelT]):
 
     # the following is all sqlalchemy implementation detail, and shouldn't be directly accessed
 
-    def _apply_limit_offset_pagination(self, limit: int, offset: int) -> None:
-        self._select = self._select.limit(limit).offset(offset)
-
-    async def _attach_to_session(
+    def _apply_filters(self, statement: Select[tuple[ModelT]], *filters: FilterTypes, **kwargs: Any) -> Select:
+        # pagination orders by the keyset last, so that it only breaks ties of the orderings set by other filters
+        keyset = any(isinstance(filter_, KeysetCursor) and filter_.id is not None for filter_ in filters)
+        # an explicit order takes precedence over relevance
+        ordered = any(isinstance(filter_, OrderBy) for filter_ in filters)
+        if keyset and ordered:
+            raise RepositoryException("Pages after a keyset cursor are in the keyset order, they can't be ordered.")
+        rank = not keyset and not ordered
+        for filter_ in sorted(filters, key=lambda filter_: isinstance(filter_, PAGINATION_TYPES)):
+            match filter_:
+                case LimitOffset(limit, offset):
+                    statement = self._apply_limit_offset_pagination(
+                        statement, limit, offset, ordered=ordered,  # noqa: F821
+                    )
+                case KeysetCursor(limit, created_at, id_):
+                    statement = self._apply_keyset_pagination(statement, limit, created_at, id_)  # noqa: F821
+                case BeforeAfter(field_name, before, after):
+                    statement = self._filter_on_datetime_field(statement, field_name, before, after)  # noqa: F821
+                case CollectionFilter(field_name, values):
+                    statement = self._filter_in_collection(statement, field_name, values)  # noqa: F821
+                case OrderBy(field_name, sort_order):
+                    statement = self._order_by(statement, field_name, sort_order)  # noqa: F821
+                case SearchFilter(field_names, query, SearchMode.fuzzy):
+                    statement = self._filter_similar(statement, field_names, query, rank=rank)  # noqa: F821
+                case SearchFilter(field_names, query):
+                    statement = self._filter_like_collection(statement, field_names, query)  # noqa: F821
+                case FullTextSearchFilter(field_name, query):
+                    statement = self._filter_full_text(statement, field_name, query, rank=rank)  # noqa: F821
+                case SchemaProjection(schema):
+                    statement = statement.options(*self._get_projection_options(schema))  # noqa: F821
+        return self._filter_select_by_kwargs(statement, **kwargs)
+
+    def _apply_limit_offset_pagination(self, statement: Select, limit: int, offset: int, *, ordered: bool) -> Select:
+        # order with an `id` tiebreaker is already deterministic
+        if not ordered:
+            statement = statement.order_by(*self._keyset_columns())
+        return statement.limit(limit).offset(offset)
+
+    def _apply_keyset_pagination(
         self,
-        session: AsyncSession, *,
-        model: ModelT,
-        strategy: Literal["add", "merge"] = "add",
-    ) -> ModelT:
-        """Attach detached instance to the session.
+        statement: Select,
+        limit: int,
+        created_at: datetime | None,
+        id_: Any | None,
+    ) -> Select:
+        keyset_columns = self._keyset_columns()
+        if created_at is not None and id_ is not None:
+            statement = statement.where(tuple_(*keyset_columns) > tuple_(created_at, id_))
+        return statement.order_by(*keyset_columns).limit(limit)
+
+    def _apply_loading_plan(self, statement: Select[tuple[ModelT]], operation: str) -> Select[tuple[ModelT]]:
+        return statement.options(*self._loading_options.get(operation, ()))
+
+    def _build_loading_option(self, path: str) -> Load:
+        """Eager load relationships along the dotted `path`, e.g. `books.author`."""
+        model, option = self.model_type, None
+        for key in path.split("."):
+            attribute = getattr(model, key)
+            option = self._eager_load(attribute, option)
+            model = attribute.property.mapper.class_
+        return option
+
+    @staticmethod
+    def _eager_load(attribute: InstrumentedAttribute, path: Load | None = None) -> Load:
+        """Eager load a relationship without extra statements per row.
+
+        Collections are loaded in one more `SELECT ... IN`, many-to-one and one-to-one relationships in a `JOIN`.
+        """
+        if attribute.property.uselist:
+            return selectinload(attribute) if path is None else path.selectinload(attribute)
+        return joinedload(attribute) if path is None else path.joinedload(attribute)
+
+    def _check_sortable_attributes(self) -> None:
+        mapper = inspect(self.model_type)
+        indexed = {tuple(column.key for column in index.columns)[:2] for index in mapper.local_table.indexes}
+        id_key = mapper.attrs[self.id_attribute].columns[0].key
+        for attribute in self.sortable_attributes:
+            if (mapper.attrs[attribute].columns[0].key, id_key) not in indexed:
+                raise RepositoryException(
+                    f"Ordering by `{attribute}` requires an index on `({attribute}, {self.id_attribute})` "
+                    f"of `{self.model_type.__tablename__}`, otherwise every ordered query sorts the whole table.",
+                )
+
+    def _returning(self, statement: DMLT) -> DMLT:
+        """Return instances written by `statement`, in the same round trip."""
+        return statement.returning(self.model_type).options(*self._returning_options)
+
+    def _build_insert_statement(self, updated_keys: abc.Set[str] | None = None) -> Insert:
+        """Build multi-row `INSERT ... RETURNING` statement, with `ON CONFLICT DO UPDATE` of `updated_keys` if given."""
+        statement = insert(self.model_type)
+        if updated_keys is not None:
+            immutable_keys = {*self.upsert_conflict_attributes, self.id_attribute, "created_at"}
+            statement = statement.on_conflict_do_update(
+                index_elements=self.upsert_conflict_attributes,
+                set_={key: statement.excluded[key] for key in {*updated_keys, "updated_at"} - immutable_keys},
+            )
+        return self._returning(statement)
+
+    def _get_upsert_statement(self, updated_keys: frozenset[str]) -> Insert:
+        """Get the multi-row upsert statement that overwrites only `updated_keys` of existing instances."""
+        if updated_keys not in self._upsert_statements:
+            self._upsert_statements[updated_keys] = self._build_insert_statement(updated_keys)
+        return self._upsert_statements[updated_keys]
+
+    async def _estimate_count(self, session: AsyncSession) -> int | None:
+        """Get the planner's estimate of the table size if it is big enough for an exact count to be expensive."""
+        estimate = await session.scalar(ESTIMATE_COUNT_STATEMENT, {"table_name": self.model_type.__tablename__})
+        if estimate is None or estimate < self.count_estimate_threshold:
+            return None
+        return estimate
+
+    async def _insert_many(self, *batches: tuple[Insert, list[dict[str, Any]]]) -> list[ModelT]:
+        """Execute statements of `batches` with one round trip per `bulk_chunk_size` rows in a single transaction."""
+        instances = []
+        async with self._session_factory() as session:
+            for statement, rows in batches:
+                for chunk in chunked(rows, self.bulk_chunk_size):
+                    # a single multi-row `VALUES`, loader options don't apply to an `executemany` of ORM inserts
+                    instances.extend((await session.scalars(statement.values(chunk))).all())
+            await session.commit()
+            for instance in instances:
+                session.expunge(instance)
+            return instances
 
-        Args:
-            model: The instance to be attached to the session.
-            strategy: How the instance should be attached.
+    async def _get_many(self, bind: Engine, ids: list[Any]) -> dict[Any, ModelT]:
+        """Load instances batched by `get` calls in one statement."""
+        async with self._session_factory() as session:
+            result = await session.scalars(self._get_many_statement, {"ids": ids}, bind_arguments={"bind": bind})
+            instances = result.unique().all()
+            for instance in instances:
+                session.expunge(instance)
+            return {self.get_id_attribute_value(instance): instance for instance in instances}
+
+    def _get_set_values(self, instance: ModelT) -> dict[str, Any]:
+        """Get values of the column attributes explicitly set on a transient instance, except for its identifier."""
+        state = inspect(instance)
+        return {
+            attribute.key: state.dict[attribute.key]
+            for attribute in state.mapper.column_attrs
+            if attribute.key in state.dict and attribute.key != self.id_attribute
+        }
+
+    def _to_row(self, instance: ModelT) -> dict[str, Any]:
+        """Convert instance to insert parameters, leaving unset columns with defaults to the `INSERT`."""
+        row = {}
+        for attribute in inspect(self.model_type).column_attrs:
+            column = attribute.columns[0]
+            # generated columns are computed by the database
+            if column.computed is not None:
+                continue
+            value = getattr(instance, attribute.key)
+            if value is None and column.default is not None:
+                continue
+            row[attribute.key] = value
+        return row
+
+    def _get_projection_options(self, schema: type[BaseModel]) -> list[LoaderOption]:
+        """Get loader options that load only the columns and relationships serialized by `schema`.
+
+        Options are built once per schema, keyset columns are always loaded to build the next page cursor, and
+        `updated_at` to validate the client's copy of the page.
+        """
+        if schema not in self._projections:
+            required_keys = {self.id_attribute, "created_at", "updated_at"}
+            self._projections[schema] = self._build_projection_options(self.model_type, schema, required_keys)
+        return self._projections[schema]
 
-        Returns:
-            The attached instance.
+    def _build_projection_options(
+        self,
+        model: type[orm.Base],
+        schema: type[BaseModel],
+        required_keys: set[str],
+        path: Load | None = None,
+    ) -> list[LoaderOption]:
+        """Map `schema` fields to `load_only` columns of `model`, relationships without a field are never loaded.
+
+        Relationships serialized with a nested schema are projected recursively.
         """
-        match strategy:
-            case "add":
-                session.add(model)
-            case "merge":
-                model = await session.merge(model)
-        await session.commit()
-        return model
-
-    async def _execute(self, session: AsyncSession) -> Result[tuple[ModelT, ...]]:
-        return await session.execute(self._select)
-
-    def _filter_in_collection(self, field_name: str, values: abc.Collection[Any]) -> None:
+        mapper = inspect(model)
+        fields = schema.__fields__
+        keys = required_keys | {attribute.key for attribute in mapper.column_attrs if attribute.key in fields}
+        options = []
+        for relationship in mapper.relationships:
+            attribute = getattr(model, relationship.key)
+            field = fields.get(relationship.key)
+            if field is None:
+                options.append(raiseload(attribute) if path is None else path.raiseload(attribute))
+                continue
+            # columns on both sides of the join are needed to populate the relationship
+            keys |= {mapper.get_property_by_column(column).key for column in relationship.local_columns}
+            if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+                related_mapper = relationship.mapper
+                related_keys = {
+                    "updated_at",
+                    *(
+                        related_mapper.get_property_by_column(column).key
+                        for column in (*related_mapper.primary_key, *relationship.remote_side)
+                    ),
+                }
+                related_path = self._eager_load(attribute, path)
+                options.extend(
+                    self._build_projection_options(related_mapper.class_, field.type_, related_keys, related_path))
+        columns = [getattr(model, key) for key in keys]
+        options.append(load_only(*columns) if path is None else path.load_only(*columns))
+        return options
+
+    def _keyset_columns(self) -> tuple[Any, Any]:
+        return self.model_type.created_at, getattr(self.model_type, self.id_attribute)
+
+    def _order_by(self, statement: Select, field_name: str, sort_order: str) -> Select:
+        if field_name not in self.sortable_attributes:
+            raise RepositoryException(f"Ordering by `{field_name}` is not supported.")
+        columns = (getattr(self.model_type, field_name), getattr(self.model_type, self.id_attribute))
+        return statement.order_by(*(column.desc() if sort_order == "desc" else column.asc() for column in columns))
+
+    def _facet_column(self, facet: Facet) -> Any:
+        column = getattr(self.model_type, facet.field_name)
+        if facet.buckets is not None:
+            column = func.width_bucket(column, literal(list(facet.buckets), ARRAY(column.type)))
+        return column.label(facet.field_name)
+
+    def _filter_in_collection(self, statement: Select, field_name: str, values: abc.Collection[Any]) -> Select:
         if not values:
-            return
-        self._select = self._select.where(getattr(self.model_type, field_name).in_(values))
+            return statement
+        return statement.where(getattr(self.model_type, field_name).in_(values))
 
-    def _filter_like_collection(self, field_names: Sequence[str], query: str | None = None) -> None:
+    def _filter_like_collection(
+        self,
+        statement: Select,
+        field_names: Sequence[str],
+        query: str | None = None,
+    ) -> Select:
         if query is None:
-            return
+            return statement
+        # wildcards typed by users are matched literally
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
         search_args = [
-            getattr(self.model_type, field_name).ilike("%{query}%".format(query=query))
+            getattr(self.model_type, field_name).ilike("%{query}%".format(query=escaped), escape="\\")
             for field_name in field_names
         ]
-        self._select = self._select.where(or_(*search_args))
+        return statement.where(or_(*search_args))
 
-    def _filter_on_datetime_field(self, field_name: str, before: datetime | None, after: datetime | None) -> None:
+    def _filter_similar(
+        self,
+        statement: Select,
+        field_names: Sequence[str],
+        query: str | None,
+        *,
+        rank: bool,
+    ) -> Select:
+        if not query:
+            return statement
+        fields = [getattr(self.model_type, field_name) for field_name in field_names]
+        # `%` is true for similarity above `pg_trgm.similarity_threshold`, unlike the function it is served by the index
+        statement = statement.where(or_(*(field.bool_op("%")(query) for field in fields)))
+        if rank:
+            statement = statement.order_by(func.greatest(*(func.similarity(field, query) for field in fields)).desc())
+        return statement
+
+    def _filter_full_text(self, statement: Select, field_name: str, query: str | None, *, rank: bool) -> Select:
+        if query is None or not query.strip():
+            return statement
+        field = getattr(self.model_type, field_name)
+        # query is split into lexemes by the same parser as the `tsvector`, so that hyphenated words and numbers
+        # are split in the same way, and every lexeme is matched as a prefix. Lexemes are cast to `tsquery`
+        # as they are, `to_tsquery()` would parse them once again.
+        lexemes = func.unnest(func.tsvector_to_array(func.to_tsvector(self.search_config, query))).column_valued()
+        prefixes = select(func.string_agg(func.quote_literal(lexemes).concat(":*"), " & ")).scalar_subquery()
+        tsquery = cast(prefixes, TSQUERY)
+        statement = statement.where(field.bool_op("@@")(tsquery))
+        if rank:
+            statement = statement.order_by(func.ts_rank(field, tsquery).desc())
+        return statement
+
+    def _filter_on_datetime_field(
+        self,
+        statement: Select,
+        field_name: str,
+        before: datetime | None,
+        after: datetime | None,
+    ) -> Select:
         field = getattr(self.model_type, field_name)
         if before is not None:
-            self._select = self._select.where(field < before)
+            statement = statement.where(field < before)
         if after is not None:
-            self._select = self._select.where(field > before)
+            statement = statement.where(field > after)
+        return statement
 
-    def _filter_select_by_kwargs(self, **kwargs: Any) -> None:
+    def _filter_select_by_kwargs(self, statement: Select, **kwargs: Any) -> Select:
         for field, value in kwargs.items():
-            self._select = self._select.where(getattr(self.model_type, field) == value)
+            statement = statement.where(getattr(self.model_type, field) == value)
+        return statement
@@ -3,7 +3,13 @@ from typing import Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .filters import BeforeAfter, CollectionFilter, LimitOffset, SearchFilter
+from .filters import (
+    BeforeAfter, CollectionFilter, FullTextSearchFilter, KeysetCursor, LimitOffset, OrderBy, SchemaProjection,
+    SearchFilter,
+)
 
-FilterTypes = BeforeAfter | CollectionFilter | SearchFilter | LimitOffset
+FilterTypes = (
+    BeforeAfter | CollectionFilter | SearchFilter | FullTextSearchFilter | LimitOffset | KeysetCursor | OrderBy |
+    SchemaProjection
+)
 SessionFactory = Callable[..., AbstractAsyncContextManager[AsyncSession]]
@@ -1,11 +1,12 @@
 import uuid
-from typing import Any, TypeVar
+from typing import Any, Generic, TypeVar
 
 from orjson import orjson
 from pydantic import BaseModel
 from pydantic.generics import GenericModel
 
 SchemaT = TypeVar("SchemaT", bound="OrjsonSchema")
+ItemT = TypeVar("ItemT")
 
 
 def orjson_dumps(value, *, default):
@@ -49,3 +50,25 @@ class BaseErrorResponse(GenericModel):
     """Exception response schema."""
 
     error: ErrorResponse
+
+
+class FacetCountSchema(BaseOrjsonSchema):
+    """Number of items with a value of a facet, or within a range of values starting at `value`."""
+
+    value: Any
+    count: int
+
+
+class FacetedListSchema(GenericModel, Generic[ItemT]):
+    """Page of items and number of all items matching the same filters per value of each facet."""
+
+    items: list[ItemT]
+    facets: dict[str, list[FacetCountSchema]]
+
+    @classmethod
+    def from_counts(cls, items: list[ItemT], counts: dict[str, dict[Any, int]]) -> "FacetedListSchema[ItemT]":
+        facets = {
+            name: [FacetCountSchema(value=value, count=count) for value, count in values.items()]
+            for name, values in counts.items()
+        }
+        return cls(items=items, facets=facets)
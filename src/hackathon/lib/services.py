@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Generic, Sequence, TypeVar
 
 from .repositories.abc import AbstractRepository
 from .repositories.sqlalchemy import ModelT
 
 if TYPE_CHECKING:
+    from .repositories.filters import Facet
     from .repositories.types import FilterTypes
 
 RepositoryT = TypeVar("RepositoryT", bound=AbstractRepository)
@@ -47,6 +48,18 @@ class Service(Generic[ModelT, RepositoryT]):
         data = await self.authorize_create(data)
         return await self.repository.add(data)
 
+    async def create_many(self, data: list[ModelT]) -> list[ModelT]:
+        """Wraps repository bulk instance creation.
+
+        Args:
+            data: Representations to be created.
+
+        Returns:
+            Representations of created instances.
+        """
+        data = [await self.authorize_create(item) for item in data]
+        return await self.repository.add_many(data)
+
     # noinspection PyMethodMayBeStatic
     async def authorize_list(self) -> None:
         """Authorize collection access."""
@@ -64,6 +77,52 @@ class Service(Generic[ModelT, RepositoryT]):
         await self.authorize_list()
         return await self.repository.list(*filters, **kwargs)
 
+    async def list_and_count(self, *filters: FilterTypes, **kwargs: Any) -> tuple[list[ModelT], int]:
+        """Wraps repository scalars operation with a total count.
+
+        Args:
+            *filters: Collection route filters.
+            **kwargs: Keyword arguments for attribute based filtering.
+
+        Returns:
+            The list of instances retrieved from the repository and the total count ignoring pagination.
+        """
+        await self.authorize_list()
+        return await self.repository.list_and_count(*filters, **kwargs)
+
+    async def count_facets(
+        self,
+        facets: Sequence[Facet],
+        *filters: FilterTypes,
+        **kwargs: Any,
+    ) -> dict[str, dict[Any, int]]:
+        """Wraps repository facet counting.
+
+        Args:
+            facets: Attributes to group instances by.
+            *filters: Collection route filters.
+            **kwargs: Keyword arguments for attribute based filtering.
+
+        Returns:
+            Number of instances per value of each facet.
+        """
+        await self.authorize_list()
+        return await self.repository.count_facets(facets, *filters, **kwargs)
+
+    async def stream(self, *filters: FilterTypes, **kwargs: Any) -> AsyncIterator[ModelT]:
+        """Wraps repository stream operation.
+
+        Args:
+            *filters: Collection route filters.
+            **kwargs: Keyword arguments for attribute based filtering.
+
+        Returns:
+            Async iterator over the instances retrieved from the repository.
+        """
+        await self.authorize_list()
+        async for instance in self.repository.stream(*filters, **kwargs):
+            yield instance
+
     async def authorize_update(self, id_: Any, data: ModelT) -> ModelT:
         """Authorize update of item.
 
@@ -116,6 +175,18 @@ class Service(Generic[ModelT, RepositoryT]):
         data = await self.authorize_upsert(id_, data)
         return await self.repository.upsert(data)
 
+    async def upsert_many(self, data: list[ModelT]) -> list[ModelT]:
+        """Wraps repository bulk upsert operation.
+
+        Args:
+            data: Representations for upsert.
+
+        Returns:
+            Updated or created representations.
+        """
+        data = [await self.authorize_create(item) for item in data]
+        return await self.repository.upsert_many(data)
+
     async def authorize_get(self, id_: Any) -> None:
         """Authorize get of item.
 
@@ -153,3 +224,24 @@ class Service(Generic[ModelT, RepositoryT]):
         """
         await self.authorize_delete(id_)
         return await self.repository.delete(id_)
+
+    async def authorize_delete_where(self, *filters: FilterTypes, **kwargs: Any) -> None:
+        """Authorize bulk delete of items.
+
+        Args:
+            *filters: Filters of items to be deleted.
+            **kwargs: Keyword arguments for attribute based filtering.
+        """
+
+    async def delete_where(self, *filters: FilterTypes, **kwargs: Any) -> list[ModelT]:
+        """Wraps repository bulk delete operation.
+
+        Args:
+            *filters: Filters of instances to be deleted.
+            **kwargs: Keyword arguments for attribute based filtering.
+
+        Returns:
+            Representations of the deleted instances.
+        """
+        await self.authorize_delete_where(*filters, **kwargs)
+        return await self.repository.delete_where(*filters, **kwargs)
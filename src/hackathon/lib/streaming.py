@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AsyncIterator, Final
+
+import orjson
+
+from starlite import MediaType, Request
+from starlite.response import StreamingResponse
+
+from .response import Response
+
+if TYPE_CHECKING:
+    from . import orm
+    from .schemas import OrjsonSchema
+
+__all__ = ["NDJSON_MEDIA_TYPE", "resolve_stream_media_type", "create_streaming_response"]
+
+# Media type of newline delimited JSON, one serialized instance per line
+NDJSON_MEDIA_TYPE: Final[str] = "application/x-ndjson"
+
+# Number of serialized instances sent to the client in one chunk
+STREAM_CHUNK_SIZE: Final[int] = 100
+
+
+def resolve_stream_media_type(request: Request, stream: bool) -> str | None:
+    """Get the media type a collection should be streamed with.
+
+    Args:
+        request: Current request.
+        stream: Whether a chunked JSON array was requested.
+
+    Returns:
+        `application/x-ndjson` if accepted by the client, `application/json` if `stream` is set, `None` if the
+        collection should be returned as a regular response.
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return NDJSON_MEDIA_TYPE
+    if stream:
+        return MediaType.JSON
+    return None
+
+
+def create_streaming_response(
+    instances: AsyncIterator[orm.Base],
+    schema: type[OrjsonSchema],
+    media_type: str,
+) -> StreamingResponse:
+    """Build a response that serializes instances as they are fetched from the database.
+
+    Args:
+        instances: Instances to stream.
+        schema: Schema the instances are serialized with.
+        media_type: Media type resolved by `resolve_stream_media_type()`.
+
+    Returns:
+        NDJSON or chunked JSON array response.
+    """
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(_iter_ndjson(instances, schema), media_type=media_type)
+    return StreamingResponse(_iter_json_array(instances, schema), media_type=media_type)
+
+
+async def _iter_ndjson(instances: AsyncIterator[orm.Base], schema: type[OrjsonSchema]) -> AsyncIterator[bytes]:
+    async for items in _iter_serialized(instances, schema):
+        yield b"\n".join(items) + b"\n"
+
+
+async def _iter_json_array(instances: AsyncIterator[orm.Base], schema: type[OrjsonSchema]) -> AsyncIterator[bytes]:
+    separator = b""
+    yield b"["
+    async for items in _iter_serialized(instances, schema):
+        yield separator + b",".join(items)
+        separator = b","
+    yield b"]"
+
+
+async def _iter_serialized(
+    instances: AsyncIterator[orm.Base],
+    schema: type[OrjsonSchema],
+) -> AsyncIterator[list[bytes]]:
+    """Serialize instances in batches of `STREAM_CHUNK_SIZE`, so that every batch is sent in one chunk."""
+    items = []
+    async for instance in instances:
+        items.append(orjson.dumps(schema.from_orm(instance).dict(), default=Response.serializer))
+        if len(items) == STREAM_CHUNK_SIZE:
+            yield items
+            items = []
+    if items:
+        yield items
@@ -1,9 +1,10 @@
 from functools import partial
 
-from starlite import Starlite, State, ValidationException
+from starlite import DefineMiddleware, Starlite, State, ValidationException
 
 from hackathon.api.urls import api_router
 from hackathon.config.settings import get_settings
+from hackathon.infrastructure.db.postgres import QueryStatsMiddleware, ReadYourWritesMiddleware, UnitOfWorkMiddleware
 from hackathon.lib import compression, exceptions, logging, openapi, response, static_files
 
 from .containers import Container, override_providers
@@ -31,6 +32,18 @@ def create_app() -> Starlite:
     container = override_providers(container)
 
     dependencies = create_project_dependencies()
+    middleware = [UnitOfWorkMiddleware]
+    if settings.database.QUERY_STATS:
+        middleware.insert(
+            0,
+            DefineMiddleware(
+                QueryStatsMiddleware, repeat_threshold=settings.database.QUERY_STATS_REPEAT_THRESHOLD),
+        )
+    if settings.database.REPLICA_URLS:
+        middleware.append(
+            DefineMiddleware(
+                ReadYourWritesMiddleware, read_your_writes_seconds=settings.database.READ_YOUR_WRITES_SECONDS),
+        )
     app = Starlite(
         after_exception=[exceptions.after_exception_hook_handler],
         compression_config=compression.config,
@@ -42,6 +55,7 @@ def create_app() -> Starlite:
             Exception: exceptions.server_exception_to_http_response,
         },
         logging_config=logging.config,
+        middleware=middleware,
         openapi_config=openapi.config,
         response_class=response.Response,
         route_handlers=[api_router],
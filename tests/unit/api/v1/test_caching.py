@@ -0,0 +1,41 @@
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_get_company_cached(client, company, advocate, query_counter):
+    """GET /companies/{id} is served from the cache, until the company or one of its advocates is changed."""
+    await client.get(f"/api/v1/companies/{company['id']}")
+
+    with query_counter:
+        cached = await client.get(f"/api/v1/companies/{company['id']}")
+    await client.patch(f"/api/v1/advocates/{advocate['id']}", json={"name": "Jane Doe"})
+    with_patched_advocate = await client.get(f"/api/v1/companies/{company['id']}")
+    await client.patch(f"/api/v1/companies/{company['id']}", json={"summary": "New summary"})
+    patched = await client.get(f"/api/v1/companies/{company['id']}")
+
+    assert len(query_counter) == 0
+    assert [item["name"] for item in cached["advocates"]] == ["John Doe"]
+    assert [item["name"] for item in with_patched_advocate["advocates"]] == ["Jane Doe"]
+    assert patched["summary"] == "New summary"
+
+
+async def test_delete_company_invalidates_cache(client, company):
+    """DELETE /companies/{id} invalidates the cached company."""
+    await client.get(f"/api/v1/companies/{company['id']}")
+
+    await client.delete(f"/api/v1/companies/{company['id']}")
+
+    await client.get(f"/api/v1/companies/{company['id']}", expected_status_code=404)
+
+
+async def test_get_company_cached_in_process(client, company):
+    """Repeated GET /companies/{id} is served by the in-process tier, without a Redis round trip."""
+    await client.get(f"/api/v1/companies/{company['id']}")
+    before = await client.get("/api/v1/debug/cache-stats")
+
+    await client.get(f"/api/v1/companies/{company['id']}")
+    after = await client.get("/api/v1/debug/cache-stats")
+
+    assert after["local"]["hits"] == before["local"]["hits"] + 1
+    assert after["redis"] == before["redis"]
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_get_company_not_modified(client, company, advocate):
+    """GET /companies/{id} with a fresh `If-None-Match` returns 304, until one of the company advocates changes."""
+    response = await client.get(f"/api/v1/companies/{company['id']}", as_response=True)
+    etag = response.headers["etag"]
+
+    not_modified = await client.get(
+        f"/api/v1/companies/{company['id']}", headers={"If-None-Match": etag}, as_response=True)
+    await client.patch(f"/api/v1/advocates/{advocate['id']}", json={"name": "Jane Doe"})
+    modified = await client.get(f"/api/v1/companies/{company['id']}", headers={"If-None-Match": etag}, as_response=True)
+
+    assert (not_modified.status_code, not_modified.content) == (304, b"")
+    assert not_modified.headers["etag"] == etag
+    assert "last-modified" not in response.headers
+    assert modified.status_code == 200
+    assert modified.headers["etag"] != etag
+
+
+async def test_get_company_stats_not_modified_since(client, company, advocate):
+    """GET /companies/{id}/stats returns 304 for `If-Modified-Since` after its `Last-Modified` only.
+
+    The second of `Last-Modified` is stale: stats may change again within it.
+    """
+    response = await client.get(f"/api/v1/companies/{company['id']}/stats", as_response=True)
+    last_modified = parsedate_to_datetime(response.headers["last-modified"])
+
+    not_modified = await client.get(
+        f"/api/v1/companies/{company['id']}/stats",
+        headers={"If-Modified-Since": format_datetime(last_modified + timedelta(seconds=1), usegmt=True)},
+        as_response=True,
+    )
+    await client.patch(f"/api/v1/advocates/{advocate['id']}", json={"years_of_experience": 10})
+    modified = await client.get(
+        f"/api/v1/companies/{company['id']}/stats",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+        as_response=True,
+    )
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert modified.json()["average_years_of_experience"] == 10
+
+
+async def test_list_companies_not_modified(client, company):
+    """GET /companies with a fresh `If-None-Match` returns 304, until one of the listed companies changes."""
+    response = await client.get("/api/v1/companies", params={"q": company["name"]}, as_response=True)
+    etag = response.headers["etag"]
+
+    not_modified = await client.get(
+        "/api/v1/companies", params={"q": company["name"]}, headers={"If-None-Match": etag}, as_response=True)
+    await client.patch(f"/api/v1/companies/{company['id']}", json={"summary": "New summary"})
+    modified = await client.get(
+        "/api/v1/companies", params={"q": company["name"]}, headers={"If-None-Match": etag}, as_response=True)
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert modified.json()[0]["summary"] == "New summary"
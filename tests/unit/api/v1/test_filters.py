@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from hackathon.lib.orm import utcnow
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_filter_companies_updated_after(client):
+    """GET /companies?updated-after=... returns companies updated after the given time only."""
+    before = utcnow() - timedelta(seconds=1)
+    company = await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+    after = utcnow() + timedelta(seconds=1)
+
+    found = await client.get("/api/v1/companies", params={"q": company["name"], "updated-after": before.isoformat()})
+    not_found = await client.get("/api/v1/companies", params={"q": company["name"], "updated-after": after.isoformat()})
+
+    assert [item["id"] for item in found] == [company["id"]]
+    assert not_found == []
+
+
+async def test_filter_companies_created_before(client):
+    """GET /companies?created-before=...&updated-before=... applies each bound to its own field."""
+    past = utcnow() - timedelta(seconds=1)
+    company = await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+    future = utcnow() + timedelta(seconds=1)
+
+    async def search(created_before: datetime, updated_before: datetime) -> list[str]:
+        companies = await client.get(
+            "/api/v1/companies",
+            params={
+                "q": company["name"],
+                "created-before": created_before.isoformat(),
+                "updated-before": updated_before.isoformat(),
+            },
+        )
+        return [item["id"] for item in companies]
+
+    assert await search(created_before=future, updated_before=future) == [company["id"]]
+    assert await search(created_before=future, updated_before=past) == []
+    assert await search(created_before=past, updated_before=future) == []
+
+
+async def test_sort_advocates(client):
+    """GET /advocates?sort=... orders advocates by a sortable attribute, breaking ties by `id`."""
+    company = await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+    word = f"word{uuid.uuid4().hex}"
+    advocates = await client.post(
+        "/api/v1/advocates/bulk",
+        json=[
+            {
+                "company_id": company["id"],
+                "name": "John Doe",
+                "username": f"advocate-{uuid.uuid4()}",
+                "short_bio": word,
+                "long_bio": "Long bio",
+                "years_of_experience": years_of_experience,
+            }
+            for years_of_experience in (3, 5, 3)
+        ],
+    )
+
+    found = await client.get("/api/v1/advocates", params={"q": word, "sort": "-years_of_experience"})
+
+    expected = sorted(advocates, key=lambda advocate: (advocate["years_of_experience"], advocate["id"]), reverse=True)
+    assert [item["username"] for item in found] == [advocate["username"] for advocate in expected]
+
+
+async def test_sort_by_unsupported_attribute(client):
+    """GET /advocates?sort=... rejects attributes that can't be sorted by without a sort of the whole table."""
+    response = await client.get("/api/v1/advocates", params={"sort": "short_bio"}, as_response=True)
+
+    assert response.status_code == 400
+
+
+async def test_sort_with_cursor(client):
+    """GET /companies?sort=...&cursor=... is rejected: pages after a cursor can only be in the keyset order."""
+    await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+    page = await client.get("/api/v1/companies", params={"page-size": 1}, as_response=True)
+
+    response = await client.get(
+        "/api/v1/companies", params={"cursor": page.headers["x-next-cursor"], "sort": "name"}, as_response=True)
+
+    assert response.status_code == 400
@@ -8,3 +8,10 @@ async def test_ok(client):
     response = await client.get("/api/v1/healthcheck")
 
     assert response
+
+
+async def test_slow_queries(client):
+    """Endpoint /debug/slow-queries returns the slow query log."""
+    response = await client.get("/api/v1/debug/slow-queries")
+
+    assert isinstance(response, list)
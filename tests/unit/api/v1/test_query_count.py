@@ -0,0 +1,205 @@
+import asyncio
+import uuid
+
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+@pytest.fixture
+async def social_account(client, advocate) -> dict:
+    return await client.post("/api/v1/social-accounts", json={"advocate_id": advocate["id"]})
+
+
+async def test_create_company(client, query_counter):
+    """POST /companies runs a single `INSERT ... RETURNING`."""
+    with query_counter:
+        company = await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+
+    assert len(query_counter) == 1
+    assert company["summary"] == "Summary"
+
+
+async def test_server_timing(client, company):
+    """Statements executed by a request are reported in the `Server-Timing` header."""
+    response = await client.get("/api/v1/companies", params={"q": company["name"]}, as_response=True)
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+
+async def test_server_timing_of_stream(client, company):
+    """Streamed responses have no `Server-Timing` header, their statements run after the headers are sent."""
+    response = await client.get("/api/v1/companies", params={"q": company["name"], "stream": True}, as_response=True)
+
+    assert [item["id"] for item in response.json()] == [company["id"]]
+    assert "server-timing" not in response.headers
+
+
+async def test_create_advocate(client, company, query_counter):
+    """POST /advocates runs a single `INSERT ... RETURNING`."""
+    username = f"advocate-{uuid.uuid4()}"
+    with query_counter:
+        advocate = await client.post(
+            "/api/v1/advocates",
+            json={
+                "company_id": company["id"],
+                "name": "John Doe",
+                "username": username,
+                "short_bio": "Short bio",
+                "long_bio": "Long bio",
+                "years_of_experience": 5,
+            },
+        )
+
+    assert len(query_counter) == 1
+    assert advocate["username"] == username
+
+
+async def test_create_social_account(client, advocate, query_counter):
+    """POST /social-accounts runs a single `INSERT ... RETURNING`."""
+    with query_counter:
+        social_account = await client.post(
+            "/api/v1/social-accounts", json={"advocate_id": advocate["id"], "github": "https://github.com/john"})
+
+    assert len(query_counter) == 1
+    assert social_account["github"] == "https://github.com/john"
+
+
+@pytest.mark.parametrize("upsert", [False, True])
+async def test_create_companies_bulk(client, query_counter, upsert):
+    """POST /companies/bulk runs a single multi-row `INSERT ... RETURNING` of the columns that aren't deferred."""
+    names = [f"company-{uuid.uuid4()}" for _ in range(3)]
+    with query_counter:
+        companies = await client.post(
+            "/api/v1/companies/bulk",
+            params={"upsert": upsert},
+            json=[{"name": name, "summary": "Summary"} for name in names],
+        )
+
+    assert len(query_counter) == 1
+    assert "search_vector" not in query_counter.statements[0].partition("RETURNING")[2]
+    assert [company["name"] for company in companies] == names
+
+
+async def test_patch_advocate(client, advocate, query_counter):
+    """PATCH /advocates/{id} runs a single `UPDATE ... RETURNING`."""
+    with query_counter:
+        patched = await client.patch(f"/api/v1/advocates/{advocate['id']}", json={"name": "Jane Doe"})
+
+    assert len(query_counter) == 1
+    assert patched["name"] == "Jane Doe"
+    assert patched["username"] == advocate["username"]
+
+
+async def test_patch_company(client, company, query_counter):
+    """PATCH /companies/{id} runs a single `UPDATE ... RETURNING`."""
+    with query_counter:
+        patched = await client.patch(f"/api/v1/companies/{company['id']}", json={"summary": "New summary"})
+
+    assert len(query_counter) == 1
+    assert patched["summary"] == "New summary"
+    assert patched["name"] == company["name"]
+
+
+async def test_patch_social_account(client, social_account, query_counter):
+    """PATCH /social-accounts/{id} runs a single `UPDATE ... RETURNING`."""
+    with query_counter:
+        patched = await client.patch(
+            f"/api/v1/social-accounts/{social_account['id']}", json={"github": "https://github.com/john"})
+
+    assert len(query_counter) == 1
+    assert patched["github"] == "https://github.com/john"
+
+
+async def test_patch_not_found(client, query_counter):
+    """PATCH of a missing instance returns 404 after a single statement."""
+    with query_counter:
+        await client.patch(f"/api/v1/advocates/{uuid.uuid4()}", json={"name": "Jane Doe"}, expected_status_code=404)
+
+    assert len(query_counter) == 1
+
+
+async def test_delete_advocate(client, advocate, query_counter):
+    """DELETE /advocates/{id} runs a single `DELETE ... RETURNING`."""
+    with query_counter:
+        await client.delete(f"/api/v1/advocates/{advocate['id']}")
+
+    assert len(query_counter) == 1
+    await client.get(f"/api/v1/advocates/{advocate['id']}", expected_status_code=404)
+
+
+async def test_delete_not_found(client, query_counter):
+    """DELETE of a missing instance returns 404 after a single statement."""
+    with query_counter:
+        await client.delete(f"/api/v1/companies/{uuid.uuid4()}", expected_status_code=404)
+
+    assert len(query_counter) == 1
+
+
+async def test_delete_companies_by_ids(client, query_counter):
+    """DELETE /companies?ids=... removes all matching companies with a single statement."""
+    companies = await client.post(
+        "/api/v1/companies/bulk",
+        json=[{"name": f"company-{uuid.uuid4()}", "summary": "Summary"} for _ in range(3)],
+    )
+    ids = [company["id"] for company in companies]
+
+    with query_counter:
+        await client.delete("/api/v1/companies", params={"ids": ids[:2]})
+
+    assert len(query_counter) == 1
+    remaining = await client.get("/api/v1/companies", params={"ids": ids})
+    assert [company["id"] for company in remaining] == ids[2:]
+
+
+async def test_delete_collection_requires_filters(client, query_counter):
+    """DELETE of a collection without filters is rejected before hitting the database."""
+    with query_counter:
+        await client.delete("/api/v1/advocates", expected_status_code=400)
+
+    assert len(query_counter) == 0
+
+
+async def test_list_advocates_projection(client, advocate, query_counter):
+    """GET /advocates selects only the columns of the short schema and doesn't load the company."""
+    with query_counter:
+        advocates = await client.get("/api/v1/advocates", params={"q": advocate["username"]})
+
+    assert len(query_counter) == 1
+    assert "long_bio" not in query_counter.statements[0]
+    assert [item["username"] for item in advocates] == [advocate["username"]]
+
+
+async def test_concurrent_get_advocates(client, company, query_counter):
+    """Concurrent GET /advocates/{id} requests are loaded with a single statement."""
+    advocates = await client.post(
+        "/api/v1/advocates/bulk",
+        json=[
+            {
+                "company_id": company["id"],
+                "name": "John Doe",
+                "username": f"advocate-{uuid.uuid4()}",
+                "short_bio": "Short bio",
+                "long_bio": "Long bio",
+                "years_of_experience": 5,
+            }
+            for _ in range(3)
+        ],
+    )
+    ids = [advocate["id"] for advocate in advocates] * 2
+
+    with query_counter:
+        fetched = await asyncio.gather(*(client.get(f"/api/v1/advocates/{id_}") for id_ in ids))
+
+    assert len(query_counter) == 1
+    assert [advocate["id"] for advocate in fetched] == ids
+
+
+async def test_get_company_loading_plan(client, company, advocate, query_counter):
+    """GET /companies/{id} loads advocates of the company with one more statement, as its loading plan declares."""
+    with query_counter:
+        detail = await client.get(f"/api/v1/companies/{company['id']}")
+
+    assert len(query_counter) == 2
+    assert [item["username"] for item in detail["advocates"]] == [advocate["username"]]
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_search_advocates(client, company, query_counter):
+    """GET /advocates?q=... matches words by prefix and orders advocates by relevance."""
+    word = f"word{uuid.uuid4().hex}"
+    advocates = await client.post(
+        "/api/v1/advocates/bulk",
+        json=[
+            {
+                "company_id": company["id"],
+                "name": "John Doe",
+                "username": f"advocate-{uuid.uuid4()}",
+                "short_bio": short_bio,
+                "long_bio": f"Long bio {word}",
+                "years_of_experience": 5,
+            }
+            for short_bio in (f"Short bio {word}", f"Short bio {word} {word}", "Short bio")
+        ],
+    )
+
+    with query_counter:
+        found = await client.get("/api/v1/advocates", params={"q": f"{word[:-4]} bio"})
+
+    assert "ts_rank" in query_counter.statements[0]
+    assert [item["username"] for item in found] == [advocates[1]["username"], advocates[0]["username"]]
+
+
+@pytest.mark.parametrize(
+    ("mode", "query"),
+    [
+        ("substring", lambda username: username[4:-4]),
+        ("fuzzy", lambda username: username[:-1] + "x"),
+    ],
+)
+async def test_search_advocates_by_trigrams(client, company, mode, query):
+    """GET /advocates?search-mode=... finds advocates by a fragment of their username or by a misspelled one."""
+    advocate = await client.post(
+        "/api/v1/advocates",
+        json={
+            "company_id": company["id"],
+            "name": "John Doe",
+            "username": uuid.uuid4().hex,
+            "short_bio": "Short bio",
+            "long_bio": "Long bio",
+            "years_of_experience": 5,
+        },
+    )
+
+    found = await client.get("/api/v1/advocates", params={"q": query(advocate["username"]), "search-mode": mode})
+
+    assert found[0]["username"] == advocate["username"]
+
+
+async def test_search_advocates_with_facets(client, company, query_counter):
+    """GET /advocates?facets=true counts all matching advocates per company and experience range in one statement."""
+    other_company = await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "S"})
+    word = f"word{uuid.uuid4().hex}"
+    await client.post(
+        "/api/v1/advocates/bulk",
+        json=[
+            {
+                "company_id": company_id,
+                "name": "John Doe",
+                "username": f"advocate-{uuid.uuid4()}",
+                "short_bio": word,
+                "long_bio": "Long bio",
+                "years_of_experience": years_of_experience,
+            }
+            for company_id, years_of_experience in (
+                (company["id"], 0), (company["id"], 4), (company["id"], 12), (other_company["id"], 5),
+            )
+        ],
+    )
+
+    with query_counter:
+        found = await client.get(
+            "/api/v1/advocates", params={"q": word, "page-size": 2, "facets": True, "experience-buckets": [10, 3]})
+
+    assert len(query_counter) == 2
+    assert "GROUPING SETS" in query_counter.statements[1]
+    assert len(found["items"]) == 2
+    assert found["facets"] == {
+        "company_id": [{"value": company["id"], "count": 3}, {"value": other_company["id"], "count": 1}],
+        "years_of_experience": [{"value": 3, "count": 2}, {"value": 10, "count": 1}, {"value": None, "count": 1}],
+    }
@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_company_stats(client, company, query_counter):
+    """GET /companies/{id}/stats follows every change of the company advocates with a single read."""
+    other_company = await client.post(
+        "/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+    advocates = await client.post(
+        "/api/v1/advocates/bulk",
+        json=[
+            {
+                "company_id": company["id"],
+                "name": "John Doe",
+                "username": f"advocate-{uuid.uuid4()}",
+                "short_bio": "Short bio",
+                "long_bio": "Long bio",
+                "years_of_experience": years_of_experience,
+            }
+            for years_of_experience in (2, 4, 9)
+        ],
+    )
+    await client.patch(f"/api/v1/advocates/{advocates[0]['id']}", json={"years_of_experience": 3})
+    await client.patch(f"/api/v1/advocates/{advocates[1]['id']}", json={"company_id": other_company["id"]})
+    await client.delete(f"/api/v1/advocates/{advocates[2]['id']}")
+
+    with query_counter:
+        stats = await client.get(f"/api/v1/companies/{company['id']}/stats")
+    all_stats = await client.get("/api/v1/companies/stats", params={"ids": [company["id"], other_company["id"]]})
+
+    assert len(query_counter) == 1
+    assert (stats["advocates_count"], stats["average_years_of_experience"]) == (1, 3)
+    assert {item["id"]: item["advocates_count"] for item in all_stats} == {company["id"]: 1, other_company["id"]: 1}
+
+
+async def test_new_company_stats(client, company):
+    """GET /companies/{id}/stats of a company without advocates has no average."""
+    stats = await client.get(f"/api/v1/companies/{company['id']}/stats")
+
+    assert (stats["advocates_count"], stats["average_years_of_experience"]) == (0, None)
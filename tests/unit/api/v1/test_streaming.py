@@ -0,0 +1,35 @@
+import uuid
+
+import orjson
+import pytest
+from sqlalchemy import select
+
+from hackathon.domain.companies import Company
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_stream_companies(client, db):
+    """GET /companies streams the whole filtered collection as NDJSON or a chunked JSON array."""
+    prefix = f"stream-{uuid.uuid4()}"
+    companies = await client.post(
+        "/api/v1/companies/bulk",
+        json=[{"name": f"{prefix}-{i}", "summary": "Summary"} for i in range(15)],
+    )
+    # rows of one bulk insert may share `created_at`, the stream is ordered by the keyset `(created_at, id)`
+    async with db.engine.connect() as connection:
+        ids = [
+            str(id_) for id_ in await connection.scalars(
+                select(Company.id)
+                .where(Company.id.in_([company["id"] for company in companies]))
+                .order_by(Company.created_at, Company.id),
+            )
+        ]
+
+    ndjson = await client.get(
+        "/api/v1/companies", params={"q": prefix}, headers={"accept": "application/x-ndjson"}, as_response=True)
+    array = await client.get("/api/v1/companies", params={"q": prefix, "stream": True})
+
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line)["id"] for line in ndjson.content.splitlines()] == ids
+    assert [company["id"] for company in array] == ids
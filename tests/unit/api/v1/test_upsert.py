@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_upsert_social_accounts_bulk(client, company, advocate):
+    """POST /social-accounts/bulk?upsert=true overwrites only the attributes set on each item, in the items order."""
+    await client.post(
+        "/api/v1/social-accounts",
+        json={"advocate_id": advocate["id"], "github": "https://github.com/old", "twitter": "https://twitter.com/old"},
+    )
+    other_advocate = await client.post(
+        "/api/v1/advocates",
+        json={
+            "company_id": company["id"],
+            "name": "Jane Doe",
+            "username": f"advocate-{uuid.uuid4()}",
+            "short_bio": "Short bio",
+            "long_bio": "Long bio",
+            "years_of_experience": 3,
+        },
+    )
+
+    upserted = await client.post(
+        "/api/v1/social-accounts/bulk",
+        params={"upsert": True},
+        json=[
+            {"advocate_id": other_advocate["id"], "linkedin": "https://linkedin.com/new"},
+            {"advocate_id": advocate["id"], "github": "https://github.com/new"},
+        ],
+    )
+
+    assert [item["advocate_id"] for item in upserted] == [other_advocate["id"], advocate["id"]]
+    assert upserted[1]["github"] == "https://github.com/new"
+    assert upserted[1]["twitter"] == "https://twitter.com/old"
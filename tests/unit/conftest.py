@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
+from alembic import command
+from alembic.config import Config
 from hackathon.main import create_app
 
-from .testlib import APIClient
+from .testlib import APIClient, QueryCounter
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
 
+    from sqlalchemy.engine import Connection
+
+    from starlite import Starlite
+
+    from hackathon.infrastructure.db.postgres import Database
+
 
 pytestmark = [pytest.mark.asyncio]
 
+ROOT_DIR = Path(__file__).parents[2]
+
 
 @pytest.fixture(scope="session")
 def event_loop() -> AbstractEventLoop:
@@ -23,7 +35,53 @@ def event_loop() -> AbstractEventLoop:
     loop.close()
 
 
+@pytest.fixture(scope="session")
+def app() -> Starlite:
+    return create_app()
+
+
 @pytest.fixture(scope="module")
-async def client() -> APIClient:
-    async with APIClient(app=create_app(), base_url="http://test") as api_client:
+async def client(app: Starlite) -> APIClient:
+    async with APIClient(app=app, base_url="http://test") as api_client:
         yield api_client
+
+
+@pytest.fixture(scope="session")
+async def db(app: Starlite) -> Database:
+    # schema is created by migrations, as in deployments, triggers and extensions aren't part of the models
+    database = app.state.container.db()
+    async with database.engine.begin() as connection:
+        await connection.run_sync(_run_migrations)
+    return database
+
+
+def _run_migrations(connection: Connection) -> None:
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+def query_counter(db: Database) -> QueryCounter:
+    return QueryCounter(db.engine)
+
+
+@pytest.fixture
+async def company(client: APIClient) -> dict:
+    return await client.post("/api/v1/companies", json={"name": f"company-{uuid.uuid4()}", "summary": "Summary"})
+
+
+@pytest.fixture
+async def advocate(client: APIClient, company: dict) -> dict:
+    return await client.post(
+        "/api/v1/advocates",
+        json={
+            "company_id": company["id"],
+            "name": "John Doe",
+            "username": f"advocate-{uuid.uuid4()}",
+            "short_bio": "Short bio",
+            "long_bio": "Long bio",
+            "years_of_experience": 5,
+        },
+    )
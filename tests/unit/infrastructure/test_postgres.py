@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+import orjson
+import pytest
+from sqlalchemy import event
+
+from hackathon.config.settings import get_settings
+from hackathon.domain.companies import Company, CompanyRepository
+from hackathon.infrastructure.db.postgres import Database, QueryStats, current_query_stats, primary_pinned_until
+from hackathon.lib.exceptions import NotFoundError
+from hackathon.lib.repositories.filters import CollectionFilter
+
+from ..testlib import QueryCounter
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("db")]
+
+
+async def test_replica_routing():
+    """Reads go to the replica, writes and reads right after them go to the primary."""
+    config = get_settings().database
+    database = Database(config.copy(update={"REPLICA_URLS": [config.URL]}))
+    repository = CompanyRepository(database.session)
+    primary, replica = QueryCounter(database.engine), QueryCounter(database.replica_engines[0])
+    primary_pinned_until.set(0)
+
+    with primary, replica:
+        await repository.list(name="missing")
+    assert (len(primary), len(replica)) == (0, 1)
+
+    with primary, replica:
+        company = await repository.add(Company(name=f"company-{uuid.uuid4()}", summary="Summary"))
+        await repository.get(company.id)
+    assert len(replica) == 0
+    assert len(primary) > 0
+
+    for engine in (database.engine, *database.replica_engines):
+        await engine.dispose()
+
+
+async def test_unit_of_work(db):
+    """Repositories share the session of the unit of work, changes are committed once or not at all."""
+    repository = CompanyRepository(db.session)
+    commits = []
+
+    def on_commit(connection):
+        commits.append(connection)
+
+    event.listen(db.engine.sync_engine, "commit", on_commit)
+
+    async with db.unit_of_work():
+        first = await repository.add(Company(name=f"company-{uuid.uuid4()}", summary="Summary"))
+        await repository.update(Company(id=first.id, summary="New summary"))
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work():
+            second = await repository.add(Company(name=f"company-{uuid.uuid4()}", summary="Summary"))
+            raise RuntimeError
+    event.remove(db.engine.sync_engine, "commit", on_commit)
+
+    assert len(commits) == 1
+    assert (await repository.get(first.id)).summary == "New summary"
+    assert await repository.list(id=second.id) == []
+
+
+async def test_get_by_string_id(db):
+    """Batched `get` finds instances by identifiers of other types than the column's, e.g. `str` from a path."""
+    repository = CompanyRepository(db.session)
+    company = await repository.add(Company(name=f"company-{uuid.uuid4()}", summary="Summary"))
+
+    by_str, by_uuid = await asyncio.gather(repository.get(str(company.id)), repository.get(company.id))
+
+    assert by_str.id == by_uuid.id == company.id
+    with pytest.raises(NotFoundError):
+        await repository.get("not an id")
+
+
+async def test_query_stats(db):
+    """Statements are counted per shape, regardless of parameter values and lengths of `IN` lists."""
+    repository = CompanyRepository(db.session)
+    query_stats = QueryStats()
+    token = current_query_stats.set(query_stats)
+
+    for index in range(3):
+        await repository.list(CollectionFilter("id", [uuid.uuid4() for _ in range(index + 1)]))
+    current_query_stats.reset(token)
+
+    assert query_stats.count == 3
+    assert query_stats.duration > 0
+    assert query_stats.repeated(2) == [(next(iter(query_stats.shapes)), 3)]
+
+
+async def test_slow_query_log():
+    """Slow statements are logged with redacted parameters and their plans, without the values of the parameters."""
+    config = get_settings().database
+    database = Database(config.copy(update={"SLOW_QUERY_SECONDS": 1e-9, "SLOW_QUERY_EXPLAIN_RATE": 1}))
+    repository = CompanyRepository(database.session)
+
+    await repository.list(name="secret name")
+    await database.engine.dispose()
+
+    [slow_query] = database.slow_queries.entries
+    assert slow_query.parameters == ["str"]
+    assert "Plan" in slow_query.plan[0]
+    assert "secret name" not in orjson.dumps(slow_query.plan).decode()
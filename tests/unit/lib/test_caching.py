@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+import math
+import uuid
+from types import SimpleNamespace
+
+import orjson
+import pytest
+import redis.asyncio as aioredis
+
+from hackathon.config.settings import get_settings
+from hackathon.domain.companies import Company
+from hackathon.infrastructure.db.postgres import Database, current_unit_of_work, primary_pinned_until
+from hackathon.lib.exceptions import NotFoundError
+from hackathon.lib.repositories.caching import CacheStats, CachingRepository, LocalCache
+
+
+class ReadRecordingRepository:
+    """Repository stub that records how its reads were routed."""
+
+    model_type = Company
+
+    def __init__(self) -> None:
+        self.reads: list[tuple[float, bool]] = []
+
+    async def get(self, id_):
+        self._record()
+        raise NotFoundError
+
+    async def list(self, *filters, **kwargs):
+        self._record()
+        return []
+
+    def normalize_id(self, id_):
+        return id_
+
+    def _record(self) -> None:
+        self.reads.append((primary_pinned_until.get(), Database.get_unit_of_work() is None))
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Entries over the size limit are evicted, the least recently used first."""
+    cache = LocalCache(size=2, ttl=60)
+    cache.set("a", 1, ())
+    cache.set("b", 2, ())
+    cache.get("a")
+
+    cache.set("c", 3, ())
+
+    assert [cache.get(key) for key in ("a", "b", "c")] == [1, None, 3]
+    assert cache.stats == CacheStats(hits=3, misses=1, evictions=1)
+
+
+def test_local_cache_expires_entries():
+    """Expired entries are evicted on lookup."""
+    cache = LocalCache(size=2, ttl=0)
+    cache.set("a", 1, ())
+
+    assert cache.get("a") is None
+    assert cache.stats == CacheStats(hits=0, misses=1, evictions=1)
+
+
+def test_local_cache_invalidates_tags():
+    """Invalidation of a tag evicts every entry tagged with it."""
+    cache = LocalCache(size=10, ttl=60)
+    cache.set("company", 1, ("tag:company:1", "tag:advocate:1"))
+    cache.set("advocate", 2, ("tag:advocate:1",))
+    cache.set("other", 3, ("tag:company:2",))
+
+    cache.invalidate(["tag:advocate:1", "tag:company:1"])
+
+    assert [cache.get(key) for key in ("company", "advocate", "other")] == [None, None, 3]
+    assert cache.stats.evictions == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_read_from_primary():
+    """Cache misses are loaded from the primary outside of the unit of work, a replica may lag behind it."""
+    repository = ReadRecordingRepository()
+    redis = aioredis.from_url(get_settings().redis.URL, decode_responses=True)
+    caching_repository = CachingRepository(
+        repository,
+        redis,
+        ttl=1,
+        get_transaction=Database.get_unit_of_work,
+        read_from_primary=Database.read_from_primary,
+    )
+
+    token = current_unit_of_work.set(SimpleNamespace(after_commit=[]))
+    try:
+        with pytest.raises(NotFoundError):
+            await caching_repository.get(uuid.uuid4())
+        await caching_repository.list(name=str(uuid.uuid4()))
+    finally:
+        current_unit_of_work.reset(token)
+        await redis.close(close_connection_pool=True)
+
+    assert repository.reads == [(math.inf, True), (math.inf, True)]
+
+
+@pytest.mark.asyncio
+async def test_local_cache_listener_survives_malformed_messages():
+    """Listener clears the cache on a message it can't handle and keeps handling the following ones."""
+    channel = f"cache:invalidations:{uuid.uuid4()}"
+    redis = aioredis.from_url(get_settings().redis.URL, decode_responses=True)
+    cache = LocalCache(size=10, ttl=60)
+    listener = asyncio.create_task(cache.listen(redis, channel))
+    try:
+        # wait for the subscription, messages published before it are lost
+        while (await redis.pubsub_numsub(channel))[0][1] == 0:
+            await asyncio.sleep(0.01)
+        cache.set("a", 1, ("tag:a",))
+        await redis.publish(channel, "not json")
+        await asyncio.sleep(0.1)
+        cleared = cache.get("a")
+
+        cache.set("b", 2, ("tag:b",))
+        await redis.publish(channel, orjson.dumps(["tag:b"]))
+        await asyncio.sleep(0.1)
+
+        assert cleared is None
+        assert cache.get("b") is None
+        assert not listener.done()
+    finally:
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+        await redis.close(close_connection_pool=True)
@@ -0,0 +1,48 @@
+import base64
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from hackathon.lib.pagination import NEXT_CURSOR_HEADER, create_pagination_headers, decode_cursor, encode_cursor
+from hackathon.lib.repositories.filters import KeysetCursor, LimitOffset
+
+
+def _item() -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), created_at=datetime(2022, 10, 17, 14, 35, 30, 831056))
+
+
+def test_cursor_roundtrip():
+    """Cursor built from the last row points right after it."""
+    item = _item()
+
+    cursor = decode_cursor(encode_cursor(item), 10)
+
+    assert cursor == KeysetCursor(limit=10, created_at=item.created_at, id=item.id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage",
+        "W10",
+        encode_cursor(_item())[:-3],
+        base64.urlsafe_b64encode(orjson.dumps(["2024-01-01T00:00:00", 5])).decode(),
+        base64.urlsafe_b64encode(orjson.dumps([0, str(uuid.uuid4())])).decode(),
+    ],
+)
+def test_cursor_invalid(cursor):
+    """Malformed cursor raises `ValueError`."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 10)
+
+
+def test_next_cursor_full_page():
+    """Next page cursor is returned only for a full page."""
+    items = [_item(), _item()]
+
+    assert create_pagination_headers(items, LimitOffset(2, 0)) == {NEXT_CURSOR_HEADER: encode_cursor(items[-1])}
+    assert create_pagination_headers(items, KeysetCursor(3)) == {}
+    assert create_pagination_headers(items) == {}
@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Any, Union
 
 import orjson
 from httpx import AsyncClient
+from sqlalchemy import event
 
 if TYPE_CHECKING:
     from httpx import Response
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
     APIResponse = Union[dict, str, list[dict], dict[str, Any]]
 
@@ -50,7 +52,7 @@ class APIClient(AsyncClient):
 
     def _decode(self, response: Response) -> APIResponse:
         content = response.content.decode("utf-8", errors="ignore")
-        if self.is_json(response):
+        if content and self.is_json(response):
             return orjson.loads(content)
         return content
 
@@ -60,3 +62,25 @@ class APIClient(AsyncClient):
         if content_type is None:
             return False
         return "json" in content_type
+
+
+class QueryCounter:
+    """Records SQL statements sent to the database by the given engine."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine.sync_engine
+        self.statements: list[str] = []
+
+    def __enter__(self) -> QueryCounter:
+        self.statements.clear()
+        event.listen(self._engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, _conn, _cursor, statement: str, *_: Any) -> None:
+        self.statements.append(statement)